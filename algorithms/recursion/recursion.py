@@ -1,6 +1,11 @@
 """Collection of recursive algorithms"""
 from fractions import Fraction
 
+try:
+	from arrays import reversal
+except ImportError:  # Run as a script without the repository root on the path: linear_reverse swaps pairs itself
+	reversal = None
+
 
 # Factorial function
 def factorial(n):
@@ -73,9 +78,17 @@ def linear_sum(data, n):
 
 # Linear reverse list
 def linear_reverse(data, start, stop):
-	if start < stop - 1:
-		data[start], data[stop - 1] = data[stop - 1], data[start]
-		linear_reverse(data, start + 1, stop - 1)
+	"""
+	Reverse data[start:stop] in place without one frame per pair, using the blockwise reversal of
+	arrays/reversal.py when it is importable and swapping pairs from both ends in a loop otherwise
+	"""
+	if reversal is not None:
+		return reversal.reverse(data, start, stop)
+	stop -= 1
+	while start < stop:
+		data[start], data[stop] = data[stop], data[start]
+		start += 1
+		stop -= 1
 	return data
 
 
@@ -5,14 +5,101 @@ By Utilizing the concrete Array from C, a DynamicArray can shrink and expand dyn
 to accommodate deletion and addition of new elements. This low-level behaviour enables
 Lists in Python to extend C's concrete Array and add Dynamic operations on top of it.
 """
+import array
+import collections
 import ctypes
+import math
+import mmap
+import os
+import random
+import string
+import struct
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import reversal
+except ImportError:  # Imported as arrays.arrays from the repository root
+    from arrays import reversal
+
+# Fixed-width C types backing the typed storage mode. Typecodes follow the array module's conventions, and values
+# are checked against them as array.array does: ctypes alone would silently wrap out-of-range integers.
+TYPECODES = {
+    'b': ctypes.c_byte, 'B': ctypes.c_ubyte,
+    'h': ctypes.c_short, 'H': ctypes.c_ushort,
+    'i': ctypes.c_int, 'I': ctypes.c_uint,
+    'l': ctypes.c_long, 'L': ctypes.c_ulong,
+    'q': ctypes.c_longlong, 'Q': ctypes.c_ulonglong,
+    'f': ctypes.c_float, 'd': ctypes.c_double,
+}
+
+
+# Growth policies. Each maps (current capacity, slots needed) to the new capacity, which is at least the slots needed
+def grow_double(capacity, needed):
+    """Double the capacity: the classic amortized O(1) append"""
+    return max(2 * capacity, needed)
+
+
+def grow_by_half(capacity, needed):
+    """Grow by a factor of 1.5, trading a few more resizes for less slack memory"""
+    return max(capacity + (capacity >> 1), needed)
+
+
+def grow_cpython(capacity, needed):
+    """Mild over-allocation proportional to the new size, as done by CPython's list_resize"""
+    return max((needed + (needed >> 3) + 6) & ~3, needed)
+
+
+def fixed_chunk(size):
+    """Return a policy that grows the capacity in fixed chunks of size slots"""
+    if size < 1:
+        raise ValueError('Chunk size must be positive')
+
+    def grow_chunk(capacity, needed):
+        return -(-needed // size) * size
+    return grow_chunk
+
+
+GROWTH_POLICIES = {
+    'double': grow_double,
+    '1.5': grow_by_half,
+    'cpython': grow_cpython,
+    'chunk': fixed_chunk(1024),
+}
 
 
 class DynamicArray:
     """Dynamic array similar to python's list"""
 
-    def __init__(self):
-        """Create empty array"""
+    def __init__(self, typecode=None, growth='double', shrink_at=None, indexed=False):
+        """
+        Create empty array. When a typecode e.g 'd' or 'q' is given, elements are stored unboxed in a
+        contiguous C buffer instead of as references to Python objects.
+        growth is a key of GROWTH_POLICIES or a callable (capacity, needed) -> new capacity.
+        shrink_at is an optional load factor below 0.5, e.g 0.25: once n drops below capacity * shrink_at the
+        capacity is halved until the array is back above it. Keeping it under 0.5 leaves a halved array at most
+        2 * shrink_at full, so the appends that follow a shrink do not immediately grow it back.
+        indexed keeps a hash index of value -> multiplicity so that membership, count and remove never scan,
+        plus a value -> positions index for index() that is rebuilt lazily after edits that shift positions.
+        Elements must then be hashable.
+        """
+        if typecode is not None and typecode not in TYPECODES:
+            raise ValueError('Unsupported typecode {0!r}'.format(typecode))
+        if not callable(growth) and growth not in GROWTH_POLICIES:
+            raise ValueError('Unknown growth policy {0!r}'.format(growth))
+        if shrink_at is not None and not 0 < shrink_at < 0.5:
+            raise ValueError('shrink_at must be a load factor between 0 and 0.5')
+        self._typecode = typecode
+        self._ctype = TYPECODES[typecode] if typecode is not None else ctypes.py_object
+        self._probe = array.array(typecode, [0]) if typecode is not None else None  # One slot to validate values
+        self._growth = growth
+        self._grow = growth if callable(growth) else GROWTH_POLICIES[growth]
+        self._shrink_at = shrink_at
+        self._indexed = indexed
+        self._counts = {} if indexed else None  # value -> multiplicity, kept exact by every edit
+        self._index = {} if indexed else None  # value -> set of positions. None while stale or disabled
+        self._resizes = 0  # Telemetry: number of reallocations so far
+        self._bytes_copied = 0  # Telemetry: bytes moved into new buffers by those reallocations
         self._n = 0  # Total number of elements in the array
         self._capacity = 1  # The capacity of the array
         # Actual concrete array created using ctypes
@@ -23,19 +110,101 @@ class DynamicArray:
         return self._n  # Allows for constant time lookup of an array's length
 
     def __getitem__(self, key):
-        """Retrieves an item from the array e.g array[0]"""
-        if key < 0:  # Handle negative indices
-            key += self._n
-        if not 0 <= key <= self._n:
-            raise IndexError('Index Out of Range')
+        """Retrieves an item or a slice from the array e.g array[0] or array[1:3]"""
+        if isinstance(key, slice):
+            start, stop, step = key.indices(self._n)
+            if step == 1:
+                new = self._new_like()
+                new._copy_in(self._A, start, max(stop - start, 0))
+                return new
+            return self._from_values([self._A[i] for i in range(start, stop, step)])
+        key = self._normalize(key)
         return self._A[key]
 
+    def __setitem__(self, key, value):
+        """Replaces an item or a slice of the array e.g array[0] = 1 or array[1:3] = [4, 5, 6]"""
+        if not isinstance(key, slice):
+            key = self._normalize(key)
+            self._check(value)
+            if self._indexed:
+                self._unindex(key)
+            self._A[key] = value
+            if self._indexed:
+                self._index_slot(key)
+            return
+        start, stop, step = key.indices(self._n)
+        values = value._A[:value._n] if isinstance(value, DynamicArray) else list(value)
+        if step == 1:
+            values = self._pack(values)  # Validate before the tail moves, so a bad value leaves the array intact
+            stop = max(stop, start)
+            m = len(values)
+            delta = m - (stop - start)
+            if self._indexed:
+                for k in range(start, stop):
+                    self._unindex(k)
+                if delta:
+                    self._invalidate_index()
+            if delta > 0:
+                self._ensure(self._n + delta)
+            # One block move opens or closes the gap, then the new values land in a single slice assignment
+            self._move(stop, stop + delta, self._n - stop)
+            if delta < 0:
+                self._clear_range(self._n + delta, self._n)
+            self._A[start:start + m] = values
+            if self._indexed:
+                for k in range(start, start + m):
+                    self._index_slot(k)
+            self._n += delta
+            if delta < 0:
+                self._maybe_shrink()
+            return
+        indices = range(start, stop, step)
+        if len(values) != len(indices):
+            raise ValueError('Attempt to assign sequence of size {0} to extended slice of size {1}'.format(
+                len(values), len(indices)))
+        values = self._pack(values)
+        for idx, val in zip(indices, values):
+            if self._indexed:
+                self._unindex(idx)
+            self._A[idx] = val
+            if self._indexed:
+                self._index_slot(idx)
+
     def __repr__(self):
         """Returns the string representation of the dynamic array e.g str(array)"""
-        return str([self._A[i] for i in range(self._n)])
+        return str(self._A[:self._n])
+
+    def __buffer__(self, flags):
+        """Buffer protocol hook (PEP 688) so memoryview(array) and numpy wrap the typed storage without copying"""
+        return self.buffer()
+
+    def __release_buffer__(self, view):
+        """Release a view previously handed out by __buffer__"""
+        view.release()
+
+    @property
+    def typecode(self):
+        """The typecode of the typed storage, or None when storing arbitrary Python objects"""
+        return self._typecode
+
+    @property
+    def itemsize(self):
+        """Size in bytes of a single storage slot"""
+        return ctypes.sizeof(self._ctype)
+
+    def buffer(self):
+        """
+        Return a memoryview over the n stored elements of a typed array e.g numpy.frombuffer(arr.buffer()).
+        The view shares memory with the array and goes stale once the array resizes.
+        """
+        if self._typecode is None:
+            raise TypeError('Object arrays do not expose a buffer, construct with a typecode')
+        return memoryview(self._A).cast('B')[:self._n * self.itemsize].cast(self._typecode)
 
     def __contains__(self, item):
         """Returns True if item is found in array: Represented as item in array e.g item in array"""
+        if self._indexed:
+            return item in self._counts
         for idx in range(self._n):
             if self._A[idx] == item:
                 return True
@@ -43,11 +212,10 @@ class DynamicArray:
 
     def __add__(self, other):
         """Concatenates second array to the first array e.g array + other"""
-        new = DynamicArray()
-        for k in range(self._n):
-            new.append(self._A[k])
-        for j in range(len(other)):
-            new.append(other[j])
+        new = self._new_like()
+        new.reserve(self._n + len(other))  # Size the result once so neither copy below has to grow it
+        new._copy_in(self._A, 0, self._n)
+        new.extend(other)
         return new
 
     def __reversed__(self):
@@ -56,14 +224,38 @@ class DynamicArray:
             yield self._A[idx]
 
     def __delitem__(self, key):
-        """Deletes an item given its index"""
-        if not (0 <= key < self._n):
-            raise IndexError('Index Out of range!')
-        for j in range(key, self._n - 1):
-            self._A[j] = self._A[j + 1]
+        """Deletes an item or a slice given its index e.g del array[0] or del array[::2]"""
+        if isinstance(key, slice):
+            indices = range(*key.indices(self._n))
+            if not indices:
+                return
+            if indices.step < 0:
+                indices = indices[::-1]
+            first, last = indices[0], indices[-1] + 1
+            if self._indexed:
+                for i in indices:
+                    self._unindex(i)
+                if last != self._n or indices.step != 1:
+                    self._invalidate_index()
+            if indices.step == 1:
+                # Contiguous range: slide the tail down over the hole in one block move
+                self._move(last, first, self._n - last)
+            else:
+                kept = [self._A[i] for i in range(first, self._n) if i not in indices]
+                self._A[first:first + len(kept)] = kept
+            removed = len(indices)
+        else:
+            key = self._normalize(key)
+            if self._indexed:
+                self._unindex(key)
+                if key != self._n - 1:
+                    self._invalidate_index()
+            self._move(key + 1, key, self._n - key - 1)
+            removed = 1
         # Optional since del performs garbage collection automatically,, I think...
-        self._A[self._n - 1] = None
-        self._n -= 1
+        self._clear_range(self._n - removed, self._n)
+        self._n -= removed
+        self._maybe_shrink()
 
     def __iter__(self):
         """Iterator magic function to enable the DynamicArray to be iteratable"""
@@ -72,58 +264,238 @@ class DynamicArray:
 
     def append(self, obj):
         """Insert into the dynamic array an obj at the last index available"""
+        self._check(obj)
         if self._n == self._capacity:  # There isn't enough space
-            self._resize(2 * self._capacity)
+            self._ensure(self._n + 1)
         # n is applicable as an index pointing to an index after the last element is there
         self._A[self._n] = obj
+        if self._indexed:
+            self._index_slot(self._n)
         # are a total of n elements in an array with extra capacity.
         self._n += 1
 
-    def _resize(self, c, shift=False, k=-1):
+    def _resize(self, c):
         """Non-public utility method for resizing the dynamic array to a new capacity c"""
         B = self._make_array(c)
-        start = self._n if shift else self._n - 1
-        if shift:
-            B[start] = 0
-        for j in range(start, -1, -1):
-            B[j] = self._A[j - 1] if shift and j > k else self._A[j]
+        if self._typecode is None:
+            B[:self._n] = self._A[:self._n]
+        else:
+            ctypes.memmove(B, self._A, self._n * self.itemsize)
+        self._resizes += 1
+        self._bytes_copied += self._n * self.itemsize
         self._A = B
         self._capacity = c
 
-    @staticmethod
-    def _make_array(c):
+    def _ensure(self, needed):
+        """Grow according to the growth policy so that at least needed slots are available"""
+        if needed > self._capacity:
+            self._resize(self._grow(self._capacity, needed))
+
+    def _maybe_shrink(self):
+        """
+        Halve the capacity while the load factor is below shrink_at, reallocating at most once.
+        The halved capacity always keeps at least one free slot, so the next append never has to grow it back.
+        """
+        if self._shrink_at is None:
+            return
+        target = self._capacity
+        while target > 1 and self._n < target * self._shrink_at and self._n < target // 2:
+            target //= 2
+        if target < self._capacity:
+            self._resize(target)
+
+    def reserve(self, c):
+        """Make room for at least c elements up front so the next appends do not reallocate"""
+        if c > self._capacity:
+            self._resize(c)
+
+    def shrink_to_fit(self):
+        """Release unused capacity so that capacity == len(array)"""
+        if self._capacity > max(self._n, 1):
+            self._resize(max(self._n, 1))
+
+    def stats(self):
+        """Return capacity and resize telemetry for tuning the growth and shrink policies"""
+        return {
+            'size': self._n,
+            'capacity': self._capacity,
+            'load_factor': self._n / self._capacity,
+            'resizes': self._resizes,
+            'bytes_copied': self._bytes_copied,
+            'bytes_allocated': self._capacity * self.itemsize,
+            'index_bytes': self._index_size(),
+        }
+
+    def _positions(self):
+        """Return the value -> positions index, rebuilding it first if a structural change left it stale"""
+        if self._index is None:
+            index = {}
+            for k in range(self._n):
+                index.setdefault(self._A[k], set()).add(k)
+            self._index = index
+        return self._index
+
+    def _index_slot(self, k):
+        """Count the value stored at k, and record position k if the positions are fresh. Typed slots coerce,
+        so the stored value is read back rather than the one assigned"""
+        value = self._A[k]
+        self._counts[value] = self._counts.get(value, 0) + 1
+        if self._index is not None:
+            self._index.setdefault(value, set()).add(k)
+
+    def _unindex(self, k):
+        """Uncount the value currently stored at k, and forget position k if the positions are fresh"""
+        value = self._A[k]
+        count = self._counts[value] - 1
+        if count:
+            self._counts[value] = count
+        else:
+            del self._counts[value]
+        if self._index is not None:
+            positions = self._index[value]
+            positions.discard(k)
+            if not positions:
+                del self._index[value]
+
+    def _invalidate_index(self):
+        """
+        Mark the positions stale after an edit that shifts them (a middle insert or delete). Only index() needs
+        them, so the next index() rebuilds them in one O(n) pass and a burst of shifting edits costs one rebuild.
+        Shifting them eagerly instead would cost O(n - k) Python operations on every such edit.
+        """
+        self._index = None
+
+    def _index_size(self):
+        """Bytes held by the hash index (the dicts and position sets, not the indexed values)"""
+        if not self._indexed:
+            return 0
+        size = sys.getsizeof(self._counts)
+        if self._index is not None:
+            size += sys.getsizeof(self._index) + sum(
+                sys.getsizeof(positions) for positions in self._index.values())
+        return size
+
+    def _make_array(self, c):
         """Create a new Array object from Cython's ctypes"""
-        return (c * ctypes.py_object)()
+        return (c * self._ctype)()
+
+    def _from_values(self, values):
+        """Build a new array of the same storage type holding the given list of values"""
+        new = self._new_like()
+        if values:
+            new.reserve(len(values))
+            new._A[:len(values)] = values
+            new._n = len(values)
+            if new._indexed:
+                new._invalidate_index()
+                for k in range(new._n):
+                    new._index_slot(k)
+        return new
+
+    def _new_like(self):
+        """Create an empty array sharing this array's storage type and resize policies"""
+        return DynamicArray(self._typecode, self._growth, self._shrink_at, self._indexed)
+
+    def _normalize(self, key):
+        """Map a possibly negative index onto 0 <= key < n or raise IndexError"""
+        if key < 0:  # Handle negative indices
+            key += self._n
+        if not 0 <= key < self._n:
+            raise IndexError('Index Out of Range')
+        return key
+
+    def _move(self, src, dst, count):
+        """
+        Shift count slots starting at src so they start at dst. Ranges may overlap.
+        Typed storage is moved with a single memmove, object storage with one slice assignment
+        so reference counts stay correct.
+        """
+        if count <= 0 or src == dst:
+            return
+        if self._typecode is None:
+            self._A[dst:dst + count] = self._A[src:src + count]
+        else:
+            size = self.itemsize
+            base = ctypes.addressof(self._A)
+            ctypes.memmove(base + dst * size, base + src * size, count * size)
+
+    def _copy_in(self, source, start, count):
+        """Append count slots of the ctypes array source beginning at start, growing at most once"""
+        if count <= 0:
+            return
+        if self._typecode is not None and isinstance(source, ctypes.Array) and source._type_ is self._ctype:
+            self._ensure(self._n + count)
+            size = self.itemsize
+            ctypes.memmove(ctypes.addressof(self._A) + self._n * size,
+                           ctypes.addressof(source) + start * size, count * size)
+        else:
+            values = self._pack(source[start:start + count])  # Validated before the array changes at all
+            self._ensure(self._n + count)
+            self._A[self._n:self._n + count] = values
+        if self._indexed:
+            for k in range(self._n, self._n + count):
+                self._index_slot(k)
+        self._n += count
+
+    def _check(self, value):
+        """Raise TypeError or OverflowError, like array.array, if a typed slot cannot hold value exactly"""
+        if self._probe is not None:
+            self._probe[0] = value
+
+    def _pack(self, values):
+        """Return values validated for the storage (an array.array for typed storage) ready to be assigned"""
+        if self._typecode is None:
+            return values
+        return array.array(self._typecode, values)
+
+    def _clear(self, k):
+        """Drop the reference held in slot k. Typed slots hold no references so they are left as-is"""
+        if self._typecode is None:
+            self._A[k] = None
+
+    def _clear_range(self, start, stop):
+        """Drop the references held in slots start..stop-1 with a single slice assignment"""
+        if self._typecode is None and start < stop:
+            self._A[start:stop] = [None] * (stop - start)
 
     def insert(self, k, value):
-        """Insert value at index k assuming that 0 <= k < n"""
-        if k >= self._capacity:
+        """Insert value at index k. Indices past the end append, negative indices count from the end"""
+        if k < 0:
+            k = max(k + self._n, 0)
+        if k >= self._n:
             self.append(value)
             return
+        self._check(value)  # Before the block move, which cannot be undone if the store then failed
         if self._n == self._capacity:
-            self._resize(2 * self._capacity, shift=True, k=k)
-        else:
-            # Shift items right, starting with the rightmost up-to the index k
-            for j in range(self._n, k, -1):
-                self._A[j] = self._A[j - 1]
+            self._ensure(self._n + 1)
+        # Shift items right of k one slot to the right in a single block move
+        self._move(k, k + 1, self._n - k)
         self._A[k] = value
+        if self._indexed:
+            self._invalidate_index()
+            self._index_slot(k)
         self._n += 1
 
     def remove(self, value):
         """Removes a value from the array """
+        if self._indexed:
+            if value not in self._counts:
+                raise ValueError('Value not found')
+            if self._index is not None:
+                del self[min(self._index[value])]
+                return
+            # Stale positions are not rebuilt: a scan that stops at the first match is never slower
         for k in range(self._n):
-            # Found a match. Loop over remaining items to shift them to the left
+            # Found a match. Shift remaining items to the left
             if self._A[k] == value:
-                for j in range(k, self._n - 1):
-                    # Shift items to fill the removed item
-                    self._A[j] = self._A[j + 1]
-                self._A[self._n - 1] = None  # Simple garbage collection.
-                self._n -= 1
+                del self[k]
                 return
         raise ValueError('Value not found')
 
     def count(self, value):
         """Returns the count of an occurrence of a value in the array e.g list.count(val)"""
+        if self._indexed:
+            return self._counts.get(value, 0)
         count = 0
         for i in range(self._n):
             if self._A[i] == value:
@@ -132,19 +504,26 @@ class DynamicArray:
 
     def index(self, value):
         """Returns the index of a value within the array: similar to builtin array.index(val)"""
+        if self._indexed:
+            positions = self._positions().get(value)
+            if not positions:
+                raise ValueError('Value not found!')
+            return min(positions)
         for idx in range(self._n):
             if self._A[idx] == value:
                 return idx
         raise ValueError('Value not found!')
 
     def reverse(self):
-        """Mutates the array elements into a reversed order"""
-        left, right = 0, self._n - 1
-        while left < right:
-            self._A[left], self._A[right] = self._A[right], self._A[left]
-            left += 1
-            right -= 1
-        return
+        """Mutates the array elements into a reversed order, in place and block by block (see reversal.reverse)"""
+        if self._index is not None:
+            last = self._n - 1
+            self._index = {value: {last - k for k in positions} for value, positions in self._index.items()}
+        if self._typecode is not None:
+            with self.buffer() as view:
+                reversal.reverse(view)
+        else:
+            reversal.reverse(self._A, 0, self._n)
 
     def pop(self, key=None):
         """
@@ -156,23 +535,114 @@ class DynamicArray:
             raise IndexError('Index Out of range')
         key = key if key is not None else self._n - 1
         val = self._A[key]
-        if key == self._n - 1:  # Pop in constant time since this is the last element of the array
-            val = self._A[key]
-            self._A[key] = None
-        # Remove the element and shift the remaining right-side elements to the left.
-        else:
-            for j in range(key, self._n - 1):
-                self._A[j] = self._A[j + 1]
-            self._A[self._n - 1] = None
-        self._n -= 1
+        # Popping the last element is constant time; otherwise the right-side elements shift left as one block
+        del self[key]
         return val
 
     def extend(self, other):
         """
         Adds all elements of another array to the end of the array e.g arr.extend(other)
+        The buffer grows at most once and the elements are bulk-copied in.
+        """
+        if isinstance(other, DynamicArray):
+            self._copy_in(other._A, 0, other._n)
+        else:
+            values = other if isinstance(other, list) else list(other)
+            self._copy_in(values, 0, len(values))
+
+
+class MappedArray(DynamicArray):
+    """
+    DynamicArray whose storage is a memory-mapped file, for fixed-width numeric data larger than RAM.
+    The element count lives in a small header so an existing file is reopened without parsing anything.
+    Growing the array extends the file and remaps it rather than copying into a new buffer.
+    """
+    HEADER = struct.Struct('<4s4sQ')  # magic, typecode, element count. 16 bytes keep the data aligned
+    MAGIC = b'DARR'
+
+    def __init__(self, path, typecode='d', growth='double', shrink_at=None):
+        """Open the array stored at path, creating the file if it does not exist"""
+        if typecode is None:
+            raise ValueError('MappedArray needs a fixed-width numeric typecode')
+        super().__init__(typecode, growth, shrink_at)
+        self._path = path
+        self._file = open(path, 'r+b' if os.path.exists(path) else 'w+b')
+        size = os.fstat(self._file.fileno()).st_size
+        if size:
+            magic, code, n = self.HEADER.unpack(self._file.read(self.HEADER.size))
+            if magic != self.MAGIC:
+                self._file.close()
+                raise ValueError('{0} is not a MappedArray file'.format(path))
+            if code.rstrip(b'\0').decode() != typecode:
+                self._file.close()
+                raise ValueError('{0} stores typecode {1!r}'.format(path, code.rstrip(b'\0').decode()))
+            self._n = n
+            self._capacity = max((size - self.HEADER.size) // self.itemsize, 1)
+        else:
+            self._file.truncate(self.HEADER.size + self._capacity * self.itemsize)
+        self._mm = None
+        self._map()
+        self._write_header()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _map(self):
+        """Map the whole file and lay a ctypes array over the data region behind the header"""
+        self._mm = mmap.mmap(self._file.fileno(), 0)
+        self._A = self._view()
+
+    def _view(self):
+        """A ctypes array over the data region of the current mapping"""
+        return (self._capacity * self._ctype).from_buffer(self._mm, self.HEADER.size)
+
+    def _unmap(self):
+        """
+        Drop the ctypes view first: the mmap cannot be closed while it still exports memory.
+        If a view from buffer() is still alive the mapping is kept, so the array stays usable, and BufferError is raised
+        """
+        self._A = None
+        try:
+            self._mm.close()
+        except BufferError:
+            self._A = self._view()
+            raise BufferError('Release the views returned by buffer() before the array resizes or closes') from None
+
+    def _write_header(self):
+        """Record the current element count in the file header"""
+        self.HEADER.pack_into(self._mm, 0, self.MAGIC, self._typecode.encode(), self._n)
+
+    def _resize(self, c):
+        """
+        Grow or shrink the backing file to c slots and remap it. The data stays in place on disk.
+        Views returned by buffer() must be released first, otherwise the resize raises BufferError and changes nothing
         """
-        for item in other:
-            self.append(item)
+        self._unmap()
+        self._file.truncate(self.HEADER.size + c * self.itemsize)
+        self._capacity = c
+        self._map()
+        self._resizes += 1
+
+    def extend(self, other):
+        """Adds all elements of another array to the end of the array, see DynamicArray.extend"""
+        if other is self:  # Our own mapping is about to be replaced, so copy the elements out first
+            other = self._A[:self._n]
+        super().extend(other)
+
+    def flush(self):
+        """Write the element count and all dirty pages back to the file"""
+        self._write_header()
+        self._mm.flush()
+
+    def close(self):
+        """Flush and release the mapping and the file. The array is unusable afterwards. Release buffer() views first"""
+        if self._mm is not None and not self._mm.closed:
+            self.flush()
+            self._unmap()
+            self._file.close()
 
 
 """" Application of Python Sequence Types in Problems """
@@ -180,6 +650,7 @@ class DynamicArray:
 
 class GameEntry(object):
     """Represents an entry of a list of high scores"""
+    __slots__ = '_name', '_score'
 
     def __init__(self, name, score):
         self._name = name
@@ -196,36 +667,174 @@ class GameEntry(object):
 
 
 class HighScore(object):
-    """Fixed length sequence of high scores in non-decreasing order"""
+    """
+    Fixed length sequence of high scores in non-increasing order.
+    The board is a treap: a binary search tree over (-score, submission order), heap-ordered by random priorities
+    so its expected depth is O(log capacity), whose nodes count their subtree (see PositionalList(indexed=True)).
+    Scores that cannot make the board are rejected in O(1) against the cached weakest entry; accepting an entry,
+    evicting the weakest, rank and indexing all cost expected O(log capacity).
+    Entries with equal scores keep their submission order, earlier entries ranking higher.
+    """
+
+    class _Node(object):
+        """A non-public treap node holding one entry of the board"""
+        __slots__ = '_key', '_entry', '_priority', '_left', '_right', '_count'
+
+        def __init__(self, key, entry):
+            self._key = key  # (-score, seq): ascending keys are best-first
+            self._entry = entry
+            self._priority = random.random()
+            self._left = self._right = None
+            self._count = 1  # Number of nodes in this subtree
 
     def __init__(self, capacity=10):
         """Initialize the score board with a capacity. Defaults to 10"""
-        self._board = [None] * capacity
-        self._n = 0
+        if capacity < 1:
+            raise ValueError('Capacity must be positive')
+        self._capacity = capacity
+        self._seq = 0
+        self._root = None
+        self._weakest = None  # Node of the last ranked entry, the one a full board evicts next
+
+    def __len__(self):
+        """Return the number of entries on the board"""
+        return self._root._count if self._root is not None else 0
 
     def __getitem__(self, k):
-        """Return item at index k"""
-        return self._board[k]
+        """Return the entry at rank k, 0 being the highest score"""
+        if isinstance(k, slice):
+            return [self._select(i)._entry for i in range(*k.indices(len(self)))]
+        if k < 0:
+            k += len(self)
+        if not 0 <= k < len(self):
+            raise IndexError('Invalid index')
+        return self._select(k)._entry
+
+    def __iter__(self):
+        """Yield the entries best-first with an in-order walk of the treap"""
+        stack, walk = [], self._root
+        while stack or walk is not None:
+            while walk is not None:
+                stack.append(walk)
+                walk = walk._left
+            walk = stack.pop()
+            yield walk._entry
+            walk = walk._right
 
     def __str__(self):
         """Return the string representation of the high score list"""
-        return '\n'.join(str(self._board[j]) for j in range(self._n))
+        return '\n'.join(str(entry) for entry in self)
+
+    def threshold(self):
+        """Return the score a new entry has to beat to make a full board, or None while there is room"""
+        if len(self) < self._capacity:
+            return None
+        return -self._weakest._key[0]
 
     def add(self, entry):
-        """Add a new entry to high scores"""
+        """Add a new entry to high scores. Return True if it made the board"""
         score = entry.get_score()
-
         # Check if board is not full or score is greater than last entry in the board
-        good = self._n < len(self._board) or self._board[-1].get_score < score
+        if len(self) == self._capacity and not -self._weakest._key[0] < score:
+            return False
+        self._push(score, entry)
+        return True
+
+    def add_many(self, entries):
+        """Add a batch of entries, rejecting those below the current threshold without touching the tree"""
+        capacity = self._capacity
+        added = 0
+        for entry in entries:
+            score = entry.get_score()
+            if len(self) == capacity and not -self._weakest._key[0] < score:
+                continue
+            self._push(score, entry)
+            added += 1
+        return added
+
+    def rank(self, score):
+        """Return the 1-based rank a new entry with score would take, or None if it would not make the board"""
+        # Existing entries with an equal score stay ahead of a new one, which would take the next sequence number
+        key = (-score, self._seq + 1)
+        position, walk = 1, self._root
+        while walk is not None:
+            if walk._key < key:
+                position += 1 + self._size(walk._left)
+                walk = walk._right
+            else:
+                walk = walk._left
+        return position if position <= self._capacity else None
 
-        if good:
-            if self._n < len(self._board):
-                self._n += 1
-            pos = self._n - 1  # Actual count of high-scores currently on the board
-            while pos > 0 and self._board[pos - 1].get_score() < score:
-                self._board[pos] = self._board[pos - 1]
-                pos -= 1
-            self._board[pos] = entry
+    @staticmethod
+    def _size(node):
+        return node._count if node is not None else 0
+
+    def _select(self, k):
+        """Return the node at 0-based rank k"""
+        walk = self._root
+        while True:
+            left = self._size(walk._left)
+            if k < left:
+                walk = walk._left
+            elif k == left:
+                return walk
+            else:
+                k -= left + 1
+                walk = walk._right
+
+    def _push(self, score, entry):
+        """Place an entry that makes the board, evicting the weakest one first if the board is full"""
+        if len(self) == self._capacity:
+            self._evict()
+        self._seq += 1
+        node = self._Node((-score, self._seq), entry)
+        # Descend to a leaf slot counting the new node in every subtree on the way
+        path, walk = [], self._root
+        while walk is not None:
+            walk._count += 1
+            path.append(walk)
+            walk = walk._left if node._key < walk._key else walk._right
+        if not path:
+            self._root = node
+        elif node._key < path[-1]._key:
+            path[-1]._left = node
+        else:
+            path[-1]._right = node
+        # Rotate the node up until its parent has a higher priority
+        while path and path[-1]._priority < node._priority:
+            parent = path.pop()
+            if parent._left is node:
+                parent._left, node._right = node._right, parent
+            else:
+                parent._right, node._left = node._left, parent
+            node._count = parent._count
+            parent._count = 1 + self._size(parent._left) + self._size(parent._right)
+            if not path:
+                self._root = node
+            elif path[-1]._left is parent:
+                path[-1]._left = node
+            else:
+                path[-1]._right = node
+        self._weakest = self._last()
+
+    def _evict(self):
+        """Remove the weakest entry, the rightmost node, whose left subtree takes its place"""
+        parent, walk = None, self._root
+        while walk._right is not None:
+            walk._count -= 1
+            parent, walk = walk, walk._right
+        if parent is None:
+            self._root = walk._left
+        else:
+            parent._right = walk._left
+        self._weakest = self._last()
+
+    def _last(self):
+        """Return the rightmost node, or None for an empty board"""
+        walk = self._root
+        while walk is not None and walk._right is not None:
+            walk = walk._right
+        return walk
 
 
 # Sorting Sequences
@@ -244,34 +853,83 @@ def insertion_sort(data):
 
 # Caesar's Cipher
 class CaesarCipher:
-    """Caesar's Cipher implementation with an arbitrary character shift"""
+    """
+    Caesar's Cipher implementation with an arbitrary character shift.
+    The rotation is precomputed into str/bytes translation tables so that a message is transformed by a single
+    C-level translate call. Lowercase letters and digits are only rotated when asked for.
+    """
 
-    def __init__(self, shift):
+    def __init__(self, shift, lowercase=False, digits=False):
         """Construct a Caesar cipher using a given integer for shift rotation"""
-        encoder = [''] * 26
-        decoder = [''] * 26
+        upper = string.ascii_uppercase
         encoder = [chr((i + shift) % 26 + ord('A')) for i in range(26)]
         decoder = [chr((i - shift) % 26 + ord('A')) for i in range(26)]
         self._forward = ''.join(encoder)
         self._backward = ''.join(decoder)
+        plain, forward, backward = upper, self._forward, self._backward
+        if lowercase:
+            plain += upper.lower()
+            forward += self._forward.lower()
+            backward += self._backward.lower()
+        if digits:
+            plain += string.digits
+            forward += ''.join(str((i + shift) % 10) for i in range(10))
+            backward += ''.join(str((i - shift) % 10) for i in range(10))
+        self._encode_str = str.maketrans(plain, forward)
+        self._decode_str = str.maketrans(plain, backward)
+        self._encode_bytes = bytes.maketrans(plain.encode(), forward.encode())
+        self._decode_bytes = bytes.maketrans(plain.encode(), backward.encode())
 
     def encrypt(self, message):
         """Returns the string representation of the encrypted message"""
-        return self._transform(message, self._forward)
+        return self._transform(message, self._encode_str)
 
     def decrypt(self, secret):
         """Return decrypted message given decrypted secret"""
-        return self._transform(secret, self._backward)
+        return self._transform(secret, self._decode_str)
+
+    def encrypt_bytes(self, data):
+        """Encrypt ASCII encoded bytes or bytearray"""
+        return self._transform(data, self._encode_bytes)
+
+    def decrypt_bytes(self, data):
+        """Decrypt ASCII encoded bytes or bytearray"""
+        return self._transform(data, self._decode_bytes)
+
+    def encrypt_stream(self, fileobj_in, fileobj_out, chunk_size=1 << 16, workers=None):
+        """
+        Encrypt everything read from fileobj_in into fileobj_out, holding O(chunk_size) data in memory.
+        Both text and binary file objects work. With workers > 1 chunks are translated in a process pool.
+        """
+        self._stream(fileobj_in, fileobj_out, chunk_size, workers, self._encode_str, self._encode_bytes)
+
+    def decrypt_stream(self, fileobj_in, fileobj_out, chunk_size=1 << 16, workers=None):
+        """Decrypt everything read from fileobj_in into fileobj_out, see encrypt_stream"""
+        self._stream(fileobj_in, fileobj_out, chunk_size, workers, self._decode_str, self._decode_bytes)
 
     @staticmethod
-    def _transform(original, code):
-        """Utility to perform transformation given a certain string"""
-        msg = list(original)
-        for k in range(len(msg)):
-            if msg[k].isupper():
-                j = ord(msg[k]) - ord('A')
-                msg[k] = code[j]
-        return ''.join(msg)
+    def _transform(original, table):
+        """Utility to perform transformation given a certain translation table"""
+        return original.translate(table)
+
+    @staticmethod
+    def _stream(fileobj_in, fileobj_out, chunk_size, workers, str_table, bytes_table):
+        """Translate fileobj_in into fileobj_out chunk by chunk. The cipher is stateless so chunks are independent"""
+        chunks = iter(lambda: fileobj_in.read(chunk_size), fileobj_in.read(0))
+        if not workers or workers <= 1:
+            for chunk in chunks:
+                fileobj_out.write(chunk.translate(bytes_table if isinstance(chunk, bytes) else str_table))
+            return
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            pending = collections.deque()
+            for chunk in chunks:
+                table = bytes_table if isinstance(chunk, bytes) else str_table
+                pending.append(pool.submit(CaesarCipher._transform, chunk, table))
+                # Keep a couple of chunks per worker in flight so memory stays bounded while the pool stays busy
+                if len(pending) >= 2 * workers:
+                    fileobj_out.write(pending.popleft().result())
+            while pending:
+                fileobj_out.write(pending.popleft().result())
 
 
 def sum_matrix(matrix):
@@ -282,13 +940,136 @@ def sum_matrix(matrix):
 # R-5.7 Let A be an array of size n ≥ 2 containing integers from 1 to n−1, inclusive,
 # with exactly one repeated. Describe a fast algorithm for finding the
 # integer in A that is repeated.
-def find_duplicates(data):
-    """Finds the repeated integer in a list which at least one such repetition"""
+DuplicateReport = collections.namedtuple('DuplicateReport', 'duplicate engine extra_bytes')
+
+
+def _duplicates_dict(data):
+    """Hash every element seen so far: any hashables, O(n) extra memory"""
     found = {}
     for i in range(len(data)):
         if data[i] in found:
-            return data[i]
+            return data[i], sys.getsizeof(found)
         found[data[i]] = i
+    return None, sys.getsizeof(found)
+
+
+def _duplicates_floyd(data):
+    """
+    Floyd's cycle finding for the R-5.7 case (n values drawn from 1..n-1), O(1) memory and read-only.
+    Following i -> data[i] from index 0 must enter a cycle, and the cycle's entry point is the repeated value.
+    """
+    if len(data) < 2:
+        return None, 0
+    tortoise = hare = data[0]
+    while True:
+        tortoise = data[tortoise]
+        hare = data[data[hare]]
+        if tortoise == hare:
+            break
+    tortoise = data[0]
+    while tortoise != hare:
+        tortoise = data[tortoise]
+        hare = data[hare]
+    return hare, 0
+
+
+def _duplicates_sign(data):
+    """
+    Sign marking for positive integers smaller than len(data), O(1) memory: visiting x negates data[x], so
+    meeting an already negative slot means x was seen before. The signs are restored before returning.
+    """
+    duplicate = None
+    try:
+        for i in range(len(data)):
+            x = abs(data[i])
+            if data[x] < 0:
+                duplicate = x
+                break
+            data[x] = -data[x]
+    finally:
+        for i in range(len(data)):
+            data[i] = abs(data[i])
+    return duplicate, 0
+
+
+def _duplicates_bitset(data, lo=None, hi=None):
+    """
+    One bit per value of the bounded integer domain lo..hi, i.e (hi - lo) / 8 bytes.
+    Without bounds the domain is min(data)..max(data); with them, a value outside lo..hi raises ValueError.
+    """
+    if lo is None or hi is None:
+        if not data:
+            return None, 0
+        lo, hi = min(data), max(data)
+    bits = bytearray((hi - lo) // 8 + 1)
+    for x in data:
+        if x < lo or x > hi:
+            raise ValueError('{0!r} is outside the domain {1}..{2}'.format(x, lo, hi))
+        offset = x - lo
+        mask = 1 << (offset & 7)
+        if bits[offset >> 3] & mask:
+            return x, sys.getsizeof(bits)
+        bits[offset >> 3] |= mask
+    return None, sys.getsizeof(bits)
+
+
+def _duplicates_bloom(data, error_rate=0.01):
+    """
+    Bloom filter pre-pass for any hashables. The first pass collects elements the filter may have seen before;
+    only those candidates (true repeats plus a few false positives) are tracked exactly in the second pass, so
+    memory is about 10 bits per element at a 1% error rate instead of a dict entry per element.
+    """
+    n = max(len(data), 1)
+    m = max(int(-n * math.log(error_rate) / math.log(2) ** 2), 8)
+    k = max(int(round(m / n * math.log(2))), 1)
+    bits = bytearray(m // 8 + 1)
+    candidates = set()
+    for x in data:
+        h1 = hash(x)
+        h2 = hash((h1, 0x9E3779B9)) | 1  # Double hashing: k positions from two hashes
+        seen = True
+        for i in range(k):
+            pos = (h1 + i * h2) % m
+            mask = 1 << (pos & 7)
+            if not bits[pos >> 3] & mask:
+                seen = False
+                bits[pos >> 3] |= mask
+        if seen:
+            candidates.add(x)
+    seen = set()
+    for x in data:
+        if x in candidates:
+            if x in seen:
+                return x, sys.getsizeof(bits) + sys.getsizeof(candidates) + sys.getsizeof(seen)
+            seen.add(x)
+    return None, sys.getsizeof(bits) + sys.getsizeof(candidates) + sys.getsizeof(seen)
+
+
+DUPLICATE_ENGINES = {
+    'dict': _duplicates_dict,
+    'floyd': _duplicates_floyd,
+    'sign': _duplicates_sign,
+    'bitset': _duplicates_bitset,
+    'bloom': _duplicates_bloom,
+}
+
+
+def duplicate_report(data, engine='dict', **options):
+    """
+    Run one of the DUPLICATE_ENGINES and return a DuplicateReport with the first repeated element found
+    (None if there is none) and the bytes of auxiliary memory the engine allocated.
+    'floyd' and 'sign' require the R-5.7 domain: positive integers smaller than len(data).
+    'bitset' takes an optional integer domain lo..hi, 'bloom' an optional error_rate.
+    """
+    if engine not in DUPLICATE_ENGINES:
+        raise ValueError('Unknown duplicate engine {0!r}'.format(engine))
+    duplicate, extra = DUPLICATE_ENGINES[engine](data, **options)
+    return DuplicateReport(duplicate, engine, extra)
+
+
+def find_duplicates(data, engine='dict', **options):
+    """Finds the repeated integer in a list which at least one such repetition"""
+    return duplicate_report(data, engine, **options).duplicate
 
 
 if __name__ == '__main__':
@@ -299,6 +1080,12 @@ if __name__ == '__main__':
     # print('SECRET: ', coded)
     decoded = enc.decrypt(coded)
     print('DECODED: ', decoded)
+    import io
+    rot = CaesarCipher(5, lowercase=True, digits=True)
+    assert rot.decrypt_bytes(rot.encrypt_bytes(b'The Eagle 1969')) == b'The Eagle 1969'
+    stream_out = io.BytesIO()
+    rot.encrypt_stream(io.BytesIO(b'landed at 20:17 ' * 1000), stream_out, chunk_size=100, workers=2)
+    assert stream_out.getvalue() == rot.encrypt_bytes(b'landed at 20:17 ' * 1000)
     simple_list = DynamicArray()
     other_list = DynamicArray()
     for i in range(6, 11):
@@ -315,5 +1102,39 @@ if __name__ == '__main__':
     # print(simple_list)
     # simple_list.extend(other_list)
     # print(simple_list)
+    typed = DynamicArray('d')
+    for i in range(5):
+        typed.append(i)
+    typed.insert(2, 9.5)
+    assert typed.pop() == 4.0 and typed.pop(0) == 0.0
+    assert typed.buffer().tolist() == [1.0, 9.5, 2.0, 3.0]
+    chunked = DynamicArray('q', growth=fixed_chunk(64), shrink_at=0.25)
+    chunked.extend(range(1000))
+    assert chunked.stats()['capacity'] == 1024
+    del chunked[10:]
+    assert chunked.stats()['capacity'] == 32 and list(chunked) == list(range(10))
+    chunked.shrink_to_fit()
+    assert chunked.stats()['capacity'] == 10
+    lookup = DynamicArray(indexed=True)
+    lookup.extend('abcab')
+    lookup.reverse()
+    assert 'c' in lookup and lookup.index('a') == 1 and lookup.count('b') == 2
+    lookup.remove('a')
+    assert lookup.index('a') == 3 and lookup.stats()['index_bytes'] > 0
+    import tempfile
+    with tempfile.TemporaryDirectory() as tmp:
+        with MappedArray(os.path.join(tmp, 'data.bin'), 'q') as mapped:
+            mapped.extend(range(100))
+            assert mapped.pop() == 99
+        with MappedArray(os.path.join(tmp, 'data.bin'), 'q') as mapped:
+            assert len(mapped) == 99 and mapped[-1] == 98 and sum(mapped) == sum(range(99))
     assert sum_matrix([[1, 2, 3], [4, 5, 6]]) == 21
     assert find_duplicates([1,2,3,4,5,6,6]) == 6
+    for name in DUPLICATE_ENGINES:
+        assert find_duplicates([3, 1, 4, 2, 5, 4], engine=name) == 4, name
+    assert duplicate_report(list(range(1, 1000)) + [7], 'bitset', lo=1, hi=999).extra_bytes < 200
+    assert find_duplicates([], engine='bitset') is None
+    board = HighScore(3)
+    board.add_many(GameEntry(name, score) for name, score in [('a', 5), ('b', 9), ('c', 5), ('d', 7), ('e', 1)])
+    assert [entry.get_name() for entry in board] == ['b', 'd', 'a']
+    assert board.rank(8) == 2 and board.rank(5) is None and not board.add(GameEntry('f', 5))
@@ -0,0 +1,170 @@
+"""
+Matrix reductions generalising arrays.sum_matrix.
+A matrix may be a nested list (or any sequence of row sequences, e.g rows of array.array), a flat array.array or
+other buffer together with its number of columns, or a 2-D NumPy array. When NumPy is installed, buffer-backed
+inputs are reduced with vectorized NumPy calls without copying; nested lists are reduced with C-level builtins
+(sum/min/max/zip/accumulate) rather than a per-element generator. reduce_stream handles matrices too large for
+memory by reading row blocks from a file iterator.
+"""
+import array
+import collections
+import itertools
+import random
+import timeit
+
+try:
+    import numpy
+except ImportError:  # NumPy is optional: every reduction has a pure Python path
+    numpy = None
+
+MatrixSummary = collections.namedtuple('MatrixSummary', 'rows total column_sums minimum maximum')
+
+
+def _as_numpy(matrix, columns=None):
+    """Return a 2-D ndarray view of matrix when the vectorized path applies, otherwise None"""
+    if numpy is None:
+        return None
+    if isinstance(matrix, numpy.ndarray):
+        return matrix if matrix.ndim == 2 else matrix.reshape(-1, columns)
+    if columns is not None:
+        # Flat buffers (array.array, memoryviews) are wrapped without copying, keeping their item format
+        return numpy.asarray(memoryview(matrix)).reshape(-1, columns)
+    return None
+
+
+def _rows(matrix, columns=None):
+    """Return matrix as a sequence of rows for the pure Python path"""
+    if columns is not None:
+        return [matrix[i:i + columns] for i in range(0, len(matrix), columns)]
+    return matrix
+
+
+def matrix_sum(matrix, columns=None):
+    """Compute the sum of all numbers in the matrix. columns gives the row length of a flat array.array"""
+    vec = _as_numpy(matrix, columns)
+    if vec is not None:
+        return vec.sum().item()
+    if columns is not None:
+        return sum(matrix)
+    return sum(map(sum, matrix))
+
+
+def row_sums(matrix, columns=None):
+    """Return the list of row totals"""
+    vec = _as_numpy(matrix, columns)
+    if vec is not None:
+        return vec.sum(axis=1).tolist()
+    return list(map(sum, _rows(matrix, columns)))
+
+
+def column_sums(matrix, columns=None):
+    """Return the list of column totals"""
+    vec = _as_numpy(matrix, columns)
+    if vec is not None:
+        return vec.sum(axis=0).tolist()
+    return [sum(col) for col in zip(*_rows(matrix, columns))]
+
+
+def matrix_min(matrix, columns=None):
+    """Return the smallest number in a non-empty matrix"""
+    vec = _as_numpy(matrix, columns)
+    if vec is not None:
+        return vec.min().item()
+    if columns is not None:
+        return min(matrix)
+    return min(map(min, matrix))
+
+
+def matrix_max(matrix, columns=None):
+    """Return the largest number in a non-empty matrix"""
+    vec = _as_numpy(matrix, columns)
+    if vec is not None:
+        return vec.max().item()
+    if columns is not None:
+        return max(matrix)
+    return max(map(max, matrix))
+
+
+def prefix_sums(matrix, columns=None):
+    """
+    Return the 2-D inclusive prefix sums (summed-area table) as a nested list: result[i][j] is the sum of
+    matrix[0..i][0..j]. Any rectangle sum is then four lookups.
+    """
+    vec = _as_numpy(matrix, columns)
+    if vec is not None:
+        return vec.cumsum(axis=0).cumsum(axis=1).tolist()
+    table = []
+    above = None
+    for row in _rows(matrix, columns):
+        running = list(itertools.accumulate(row))
+        if above is not None:
+            running = list(map(sum, zip(running, above)))
+        table.append(running)
+        above = running
+    return table
+
+
+def reduce_stream(lines, block_rows=4096, sep=None, dtype=float):
+    """
+    Reduce a matrix read from an iterator of text rows (e.g an open file) holding only block_rows rows in
+    memory at a time. Each line holds one row of numbers separated by sep (whitespace by default); blank
+    lines are skipped. Returns a MatrixSummary of the row count, total, column sums, minimum and maximum.
+    """
+    rows = 0
+    total = 0
+    col_totals = None
+    lo = hi = None
+    parsed = ([dtype(x) for x in line.split(sep)] for line in lines if line.strip())
+    while True:
+        block = list(itertools.islice(parsed, block_rows))
+        if not block:
+            break
+        rows += len(block)
+        if numpy is not None:
+            vec = numpy.array(block)
+            total += vec.sum().item()
+            block_cols = vec.sum(axis=0).tolist()
+            block_lo, block_hi = vec.min().item(), vec.max().item()
+        else:
+            total += matrix_sum(block)
+            block_cols = column_sums(block)
+            block_lo, block_hi = matrix_min(block), matrix_max(block)
+        col_totals = block_cols if col_totals is None else list(map(sum, zip(col_totals, block_cols)))
+        lo = block_lo if lo is None else min(lo, block_lo)
+        hi = block_hi if hi is None else max(hi, block_hi)
+    return MatrixSummary(rows, total, col_totals or [], lo, hi)
+
+
+def benchmark(rows=500, cols=500, number=5):
+    """Time every path against arrays.sum_matrix and check that they agree with it"""
+    try:
+        from arrays import sum_matrix
+    except ImportError:  # Imported as arrays.matrix from the repository root
+        from arrays.arrays import sum_matrix
+    nested = [[random.randrange(100) for _ in range(cols)] for _ in range(rows)]
+    flat = array.array('q', itertools.chain.from_iterable(nested))
+    text = [' '.join(map(str, row)) for row in nested]
+    expected = sum_matrix(nested)
+    candidates = [
+        ('sum_matrix (nested list)', lambda: sum_matrix(nested)),
+        ('matrix_sum (nested list)', lambda: matrix_sum(nested)),
+        ('matrix_sum (array.array)', lambda: matrix_sum(flat, columns=cols)),
+        ('reduce_stream (text rows)', lambda: reduce_stream(iter(text), dtype=int).total),
+    ]
+    if numpy is not None:
+        ndarray = numpy.array(nested)
+        candidates.append(('matrix_sum (numpy)', lambda: matrix_sum(ndarray)))
+    for name, fn in candidates:
+        assert fn() == expected, name
+        print('{0:<28}{1:>10.5f}s'.format(name, min(timeit.repeat(fn, number=1, repeat=number))))
+
+
+if __name__ == '__main__':
+    grid = [[1, 2, 3], [4, 5, 6]]
+    assert matrix_sum(grid) == 21
+    assert row_sums(grid) == [6, 15] and column_sums(grid) == [5, 7, 9]
+    assert matrix_min(grid) == 1 and matrix_max(grid) == 6
+    assert prefix_sums(grid) == [[1, 3, 6], [5, 12, 21]]
+    assert column_sums(array.array('i', [1, 2, 3, 4, 5, 6]), columns=3) == [5, 7, 9]
+    assert reduce_stream(iter(['1 2 3\n', '4 5 6\n']), block_rows=1, dtype=int) == (2, 21, [5, 7, 9], 1, 6)
+    benchmark()
@@ -0,0 +1,83 @@
+"""
+In-place sequence reversal without an auxiliary stack or a full copy.
+Whole sequences with a reverse() method (list, bytearray, array.array) are reversed by it directly. Any other
+range is reversed blockwise: the outermost blocks of the range swap places, each written back reversed, so at most
+one block is held in a temporary buffer whatever the size of the data. The same loop works on memoryviews,
+ctypes arrays and memory-mapped files, which is what lets files larger than memory be reversed in place.
+"""
+import mmap
+import os
+
+DEFAULT_BLOCK = 1 << 16  # Elements moved per step of the blockwise reversal
+
+
+def _block_copy(data, i, j):
+    """Return a copy of data[i:j] that stays valid after data[i:j] is overwritten"""
+    if isinstance(data, memoryview):
+        # Slicing a memoryview gives a view into the same memory, so copy the bytes and restore the item format
+        return memoryview(bytearray(data[i:j])).cast('B').cast(data.format)
+    return data[i:j]
+
+
+def reverse(data, start=0, stop=None, block=DEFAULT_BLOCK):
+    """
+    Reverse data[start:stop] in place and return data.
+    data may be a list, bytearray, array.array, ctypes array, mmap or a writable 1-D memoryview; wrap an mmap as
+    memoryview(m).cast(typecode) to reverse fixed-width records instead of bytes.
+    """
+    if isinstance(data, mmap.mmap):
+        data = memoryview(data)
+    n = len(data)
+    stop = n if stop is None else stop
+    if start < 0:
+        start += n
+    if stop < 0:
+        stop += n
+    start, stop = max(start, 0), min(stop, n)
+    if start == 0 and stop == n and hasattr(data, 'reverse'):
+        data.reverse()
+        return data
+    i, j = start, stop
+    while j - i > 1:
+        b = min(block, (j - i) // 2)
+        left = _block_copy(data, i, i + b)
+        data[i:i + b] = data[j - b:j][::-1]
+        data[j - b:j] = left[::-1]
+        i += b
+        j -= b
+    return data
+
+
+def reverse_file(path, typecode='B', offset=0, block=DEFAULT_BLOCK):
+    """
+    Reverse the fixed-width records of a file in place through a memory mapping, block by block.
+    offset bytes at the start of the file (e.g a header) are left untouched.
+    """
+    size = os.path.getsize(path)
+    if size <= offset:
+        return
+    with open(path, 'r+b') as f, mmap.mmap(f.fileno(), 0) as m:
+        view = memoryview(m)[offset:].cast('B').cast(typecode)
+        try:
+            reverse(view, block=block)
+        finally:
+            view.release()
+        m.flush()
+
+
+if __name__ == '__main__':
+    import array
+    import tempfile
+    assert reverse([1, 2, 3, 4, 5], 1, 4) == [1, 4, 3, 2, 5]
+    assert reverse(bytearray(b'abcdefg'), block=2) == bytearray(b'gfedcba')
+    assert reverse(array.array('d', range(9)), 2, block=3).tolist() == [0, 1, 8, 7, 6, 5, 4, 3, 2]
+    buf = array.array('i', range(10))
+    reverse(memoryview(buf), 0, 7, block=2)
+    assert buf.tolist() == [6, 5, 4, 3, 2, 1, 0, 7, 8, 9]
+    with tempfile.TemporaryDirectory() as tmp:
+        name = os.path.join(tmp, 'records.bin')
+        with open(name, 'wb') as f:
+            f.write(array.array('q', range(1000)).tobytes())
+        reverse_file(name, 'q', block=7)
+        with open(name, 'rb') as f:
+            assert array.array('q', f.read()).tolist() == list(range(999, -1, -1))
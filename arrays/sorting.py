@@ -0,0 +1,226 @@
+"""
+Hybrid adaptive sorting built around insertion sort.
+Insertion sort is fast on short or nearly sorted sequences but O(n^2) in general, so here it only sorts short runs.
+A Timsort-style driver finds the natural ascending or descending runs in the input, extends short ones to a
+minimum length with (binary) insertion sort and merges neighbouring runs until a single sorted run remains.
+"""
+import heapq
+import os
+import random
+import timeit
+from bisect import bisect_left, bisect_right
+from concurrent.futures import ProcessPoolExecutor
+
+MIN_MERGE = 64  # Inputs shorter than this are handled by insertion sort alone
+
+
+def min_run_length(n):
+    """
+    Return the minimum run length for n elements: a value in [MIN_MERGE / 2, MIN_MERGE] such that n / minrun
+    is a power of two or slightly less, which keeps the final merges balanced.
+    """
+    r = 0
+    while n >= MIN_MERGE:
+        r |= n & 1
+        n >>= 1
+    return n + r
+
+
+def _insertion_sort(keys, vals, lo, hi, start):
+    """
+    Binary insertion sort of keys[lo:hi] knowing keys[lo:start] is already sorted. vals (if not None) is moved along.
+    bisect_right places an element after any equal ones, which keeps the sort stable.
+    """
+    for i in range(start, hi):
+        pivot = keys[i]
+        pos = bisect_right(keys, pivot, lo, i)
+        if pos != i:
+            # A single slice assignment shifts keys[pos:i] right by one
+            keys[pos + 1:i + 1] = keys[pos:i]
+            keys[pos] = pivot
+            if vals is not None:
+                val = vals[i]
+                vals[pos + 1:i + 1] = vals[pos:i]
+                vals[pos] = val
+
+
+def _count_run(keys, vals, lo, hi):
+    """
+    Return the length of the natural run starting at lo. A strictly descending run is reversed in place so that
+    every run handed to the merge step is ascending. Strictness matters: reversing equal elements breaks stability.
+    """
+    run = lo + 1
+    if run == hi:
+        return 1
+    if keys[run] < keys[lo]:
+        while run + 1 < hi and keys[run + 1] < keys[run]:
+            run += 1
+        keys[lo:run + 1] = keys[lo:run + 1][::-1]
+        if vals is not None:
+            vals[lo:run + 1] = vals[lo:run + 1][::-1]
+    else:
+        while run + 1 < hi and not keys[run + 1] < keys[run]:
+            run += 1
+    return run + 1 - lo
+
+
+def _merge(keys, vals, lo, mid, hi):
+    """Stable merge of the adjacent ascending runs keys[lo:mid] and keys[mid:hi]"""
+    # Elements of the left run not greater than the first right element are already in place, and likewise
+    # the right run's tail that is not less than the last left element.
+    lo = bisect_right(keys, keys[mid], lo, mid)
+    hi = bisect_left(keys, keys[mid - 1], mid, hi)
+    if lo == mid or mid == hi:
+        return
+    left_keys = keys[lo:mid]
+    left_vals = vals[lo:mid] if vals is not None else None
+    i, j, k = 0, mid, lo
+    n_left = mid - lo
+    while i < n_left and j < hi:
+        if keys[j] < left_keys[i]:  # Ties go to the left run
+            keys[k] = keys[j]
+            if vals is not None:
+                vals[k] = vals[j]
+            j += 1
+        else:
+            keys[k] = left_keys[i]
+            if vals is not None:
+                vals[k] = left_vals[i]
+            i += 1
+        k += 1
+    # Whatever is left of the right run is already in place
+    keys[k:k + n_left - i] = left_keys[i:]
+    if vals is not None:
+        vals[k:k + n_left - i] = left_vals[i:]
+
+
+def _merge_collapse(keys, vals, runs):
+    """Merge runs on the stack until the Timsort invariants hold: each run is longer than the two above it combined"""
+    while len(runs) > 1:
+        n = len(runs) - 2
+        if (n > 0 and runs[n - 1][1] <= runs[n][1] + runs[n + 1][1]) or \
+                (n > 1 and runs[n - 2][1] <= runs[n - 1][1] + runs[n][1]):
+            if runs[n - 1][1] < runs[n + 1][1]:
+                n -= 1
+        elif runs[n][1] > runs[n + 1][1]:
+            break
+        _merge_at(keys, vals, runs, n)
+
+
+def _merge_at(keys, vals, runs, n):
+    """Merge runs n and n + 1 of the stack"""
+    (lo, len_a), (mid, len_b) = runs[n], runs[n + 1]
+    _merge(keys, vals, lo, mid, mid + len_b)
+    runs[n] = (lo, len_a + len_b)
+    del runs[n + 1]
+
+
+def _sort(keys, vals):
+    """Stable ascending hybrid sort of keys in place, applying every move to vals as well when given"""
+    n = len(keys)
+    if n < 2:
+        return
+    if n < MIN_MERGE:
+        _insertion_sort(keys, vals, 0, n, _count_run(keys, vals, 0, n))
+        return
+    min_run = min_run_length(n)
+    runs = []  # Stack of (start, length) pending runs
+    lo = 0
+    while lo < n:
+        length = _count_run(keys, vals, lo, n)
+        if length < min_run:
+            # Short natural run: extend it with insertion sort
+            forced = min(min_run, n - lo)
+            _insertion_sort(keys, vals, lo, lo + forced, lo + length)
+            length = forced
+        runs.append((lo, length))
+        _merge_collapse(keys, vals, runs)
+        lo += length
+    while len(runs) > 1:
+        _merge_at(keys, vals, runs, len(runs) - 2)
+
+
+def hybrid_sort(data, key=None, reverse=False):
+    """
+    Sort the list data in place and return it, with the same stability guarantee and key/reverse semantics as
+    list.sort: elements with equal keys keep their original order, also when reverse is True.
+    """
+    if reverse:
+        # Reversing, sorting stably and reversing back keeps equal elements in their original order
+        data.reverse()
+    if key is None:
+        _sort(data, None)
+    else:
+        keys = [key(item) for item in data]
+        _sort(keys, data)
+    if reverse:
+        data.reverse()
+    return data
+
+
+def _sort_chunk(args):
+    """Process pool worker: sort one chunk. Module level so that it can be pickled"""
+    chunk, key, reverse = args
+    return hybrid_sort(chunk, key, reverse)
+
+
+def parallel_sort(data, key=None, reverse=False, workers=None, chunk_size=None):
+    """
+    Return a new sorted list, sorting chunks of data in a process pool and k-way merging them with a heap.
+    key must be picklable (a module level function rather than a lambda). The result is stable: heapq.merge
+    breaks ties in favour of earlier chunks, which hold the earlier elements.
+    """
+    data = list(data)
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if chunk_size is None:
+        chunk_size = -(-len(data) // max(workers, 1))
+    if len(data) <= chunk_size or workers <= 1:
+        return hybrid_sort(data, key, reverse)
+    chunks = [(data[i:i + chunk_size], key, reverse) for i in range(0, len(data), chunk_size)]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        runs = list(pool.map(_sort_chunk, chunks))
+    return list(heapq.merge(*runs, key=key, reverse=reverse))
+
+
+def benchmark(n=20000, small_n=2000, number=3):
+    """
+    Time hybrid_sort and parallel_sort against sorted() and arrays.insertion_sort on random, nearly sorted and
+    reversed integers. insertion_sort is quadratic so it runs on the smaller small_n inputs only.
+    """
+    try:
+        from arrays import insertion_sort
+    except ImportError:  # Imported as arrays.sorting from the repository root
+        from arrays.arrays import insertion_sort
+
+    def inputs(size):
+        rand = [random.randrange(size) for _ in range(size)]
+        nearly = list(range(size))
+        for _ in range(size // 100 + 1):
+            i, j = random.randrange(size), random.randrange(size)
+            nearly[i], nearly[j] = nearly[j], nearly[i]
+        return {'random': rand, 'nearly sorted': nearly, 'reversed': list(range(size, 0, -1))}
+
+    candidates = [
+        ('sorted', n, lambda d: sorted(d)),
+        ('hybrid_sort', n, lambda d: hybrid_sort(list(d))),
+        ('parallel_sort', n, lambda d: parallel_sort(d)),
+        ('hybrid_sort', small_n, lambda d: hybrid_sort(list(d))),
+        ('insertion_sort', small_n, lambda d: insertion_sort(list(d))),
+    ]
+    print('{0:<16}{1:>8}{2:>16}{3:>16}{4:>16}'.format('algorithm', 'n', 'random', 'nearly sorted', 'reversed'))
+    for name, size, fn in candidates:
+        cases = inputs(size)
+        timings = [min(timeit.repeat(lambda: fn(cases[case]), number=1, repeat=number)) for case in cases]
+        print('{0:<16}{1:>8}'.format(name, size) + ''.join('{0:>15.4f}s'.format(t) for t in timings))
+
+
+if __name__ == '__main__':
+    sample = [random.randrange(500) for _ in range(5000)]
+    assert hybrid_sort(list(sample)) == sorted(sample)
+    assert hybrid_sort(list(sample), reverse=True) == sorted(sample, reverse=True)
+    pairs = [(random.randrange(10), i) for i in range(3000)]
+    assert hybrid_sort(list(pairs), key=lambda p: p[0]) == sorted(pairs, key=lambda p: p[0])
+    assert hybrid_sort(list(pairs), key=lambda p: p[0], reverse=True) == sorted(pairs, key=lambda p: p[0], reverse=True)
+    assert parallel_sort(sample, workers=4) == sorted(sample)
+    benchmark()
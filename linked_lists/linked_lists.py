@@ -1,4 +1,9 @@
 """Linked List ADT"""
+import collections
+import itertools
+import random
+import time
+import tracemalloc
 
 
 class Empty(Exception):
@@ -23,6 +28,7 @@ class LinkedStack:
 	def __init__(self):
 		"""Initialize an empty stack"""
 		self._head = None
+		self._bottom = None  # The last node of the chain, kept so whole stacks can be spliced in O(1)
 		self._size = 0
 
 	def __len__(self):
@@ -36,8 +42,15 @@ class LinkedStack:
 	def push(self, e):
 		"""Inserts a new node with element e to the linked list at the head position"""
 		self._head = self._Node(e, self._head)
+		if self._size == 0:
+			self._bottom = self._head
 		self._size += 1
 
+	def push_many(self, values):
+		"""Push every value of an iterable, the last one ending up on top"""
+		for e in values:
+			self.push(e)
+
 	def top(self):
 		"""Returns the top element of the stack(The head of the linked-list)"""
 		if self.is_empty():
@@ -51,24 +64,127 @@ class LinkedStack:
 		value = self._head._element
 		self._head = self._head._next  # Override the head value to contain the current head's next node
 		self._size -= 1
+		if self._size == 0:
+			self._bottom = None
 		return value
 
+	def clear(self):
+		"""Remove all elements in O(1) by dropping the reference to the chain"""
+		self._head = self._bottom = None
+		self._size = 0
 
-class LinkedQueue:
-	"""FIFO Implementation using a linked list as storage"""
+	def splice(self, other):
+		"""
+		Move all elements of other on top of this stack in O(1), keeping their order so other's top becomes the top.
+		The bottom node of other is simply linked to this stack's head.
+		"""
+		if other is self:
+			raise ValueError('Cannot splice a stack onto itself')
+		if not isinstance(other, LinkedStack):
+			# Other stack types have no nodes to relink: push their elements bottom to top instead
+			self.push_many(reversed(other.pop_many(len(other))))
+			return
+		if other._size == 0:
+			return
+		other._bottom._next = self._head
+		if self._size == 0:
+			self._bottom = other._bottom
+		self._head = other._head
+		self._size += other._size
+		other.clear()
+
+	def transfer_reversed(self, target):
+		"""
+		Move all elements onto target in the order transfer(S, T) pops and pushes them, so this stack's bottom ends
+		up on top of target. The chain is reversed in place by flipping its next pointers (no nodes are allocated)
+		and then spliced onto target in O(1).
+		"""
+		if target is self:
+			raise ValueError('Cannot transfer a stack onto itself')
+		if not isinstance(target, LinkedStack):
+			target.push_many(self.pop_many(self._size))
+			return
+		prev, walk = None, self._head
+		while walk is not None:
+			walk._next, prev, walk = prev, walk, walk._next
+		self._head, self._bottom = self._bottom, self._head
+		target.splice(self)
+
+	def pop_many(self, k):
+		"""Remove and return the k topmost items as a list in pop order (topmost first)"""
+		if not 0 <= k <= self._size:
+			raise Empty('Stack holds fewer than {0} elements'.format(k))
+		return [self.pop() for _ in range(k)]
+
+
+class _NodePool:
+	"""
+	Optional free list of recycled nodes for the singly linked queues.
+	Nodes unlinked by dequeue are kept, up to pool_size of them, chained through their _next field, and enqueue
+	reuses them instead of allocating. A pool_size of 0 (the default) disables recycling.
+	"""
+
+	def _init_pool(self, pool_size):
+		if pool_size < 0:
+			raise ValueError('pool_size must be non-negative')
+		self._pool_size = pool_size
+		self._free = None  # Head of the free list
+		self._free_count = 0
+
+	def _new_node(self, e, next):
+		"""Return a node holding e, recycled from the free list when one is available"""
+		node = self._free
+		if node is None:
+			return self._Node(e, next)
+		self._free = node._next
+		self._free_count -= 1
+		node._element = e
+		node._next = next
+		return node
+
+	def _release(self, node):
+		"""Keep an unlinked node for reuse if the pool is not full, dropping its element reference"""
+		if self._free_count < self._pool_size:
+			node._element = None
+			node._next = self._free
+			self._free = node
+			self._free_count += 1
+
+
+class LinkedQueue(_NodePool):
+	"""
+	FIFO Implementation using a linked list as storage
+	LinkedQueue(unrolled=True) returns the same queue stored in blocks of block_size elements per node instead
+	(see _UnrolledChain).
+	"""
+
+	def __new__(cls, pool_size = 0, unrolled = False, block_size = 64):
+		if cls is LinkedQueue and unrolled:
+			cls = _UnrolledLinkedQueue
+		return super().__new__(cls)
 
 	class _Node:
 		"""A non-public class for storing a single node"""
+		__slots__ = '_element', '_next'
+
 		def __init__(self, element, next):
 			"""Initialize a new node"""
 			self._element = element
 			self._next = next
 
-	def __init__(self):
-		"""Initialize a new Queue"""
+	def __init__(self, pool_size = 0, unrolled = False, block_size = 64):
+		"""Initialize a new Queue, recycling up to pool_size dequeued nodes"""
 		self._head = None
 		self._tail = None
 		self._size = 0
+		self._init_pool(pool_size)
+
+	def __iter__(self):
+		"""Generate the elements from front to back"""
+		walk = self._head
+		while walk is not None:
+			yield walk._element
+			walk = walk._next
 
 	def __len__(self):
 		"""Returns number of elements in the queue"""
@@ -86,7 +202,7 @@ class LinkedQueue:
 
 	def enqueue(self, e):
 		"""Add an element to the back of the queue"""
-		newest = self._Node(e, None)  # Initialize the next of the node as None since it will be the tail anyways
+		newest = self._new_node(e, None)  # Initialize the next of the node as None since it will be the tail anyways
 		if self.is_empty():
 			self._head = newest
 		else:
@@ -98,29 +214,33 @@ class LinkedQueue:
 		"""Remove the element at the front of the queue"""
 		if self.is_empty():
 			raise Empty('Queue is empty')
-		value = self._head._element
-		self._head = self._head._next  # Set the head the the next Node. If there is not next node, head becomes None
+		head = self._head
+		value = head._element
+		self._head = head._next  # Set the head the the next Node. If there is not next node, head becomes None
 		self._size -= 1
 		if self.is_empty():  # If the queue is empty, then for sanity the _tail is set to point to None
 			self._tail = None
+		self._release(head)
 		return value
 
 
-class CircularQueue:
+class CircularQueue(_NodePool):
 	"""Queue implementation using circularly linked list for storage"""
 
 	class _Node:
 		"""Non-public class for storing a Node in a linked list"""
+		__slots__ = '_element', '_next'
 
 		def __init__(self, element, next):
 			"""Initialize a new node"""
 			self._element = element
 			self._next = next
 
-	def __init__(self):
-		"""Initialize a new queue"""
+	def __init__(self, pool_size = 0):
+		"""Initialize a new queue, recycling up to pool_size dequeued nodes"""
 		self._tail = None
 		self._size = 0
+		self._init_pool(pool_size)
 
 	def __len__(self):
 		"""Return current size of the queue"""
@@ -147,11 +267,13 @@ class CircularQueue:
 		else:
 			self._tail._next = head._next
 		self._size -= 1
-		return head._element
+		value = head._element
+		self._release(head)
+		return value
 
 	def enqueue(self, e):
 		"""Add an element at the end of the queue"""
-		newest = self._Node(e, None)
+		newest = self._new_node(e, None)
 		if self.is_empty():
 			newest._next = newest
 		else:
@@ -160,10 +282,16 @@ class CircularQueue:
 		self._tail = newest
 		self._size += 1
 
-	def rotate(self):
-		"""Rotate front element to the back of the queue"""
+	def rotate(self, k = 1):
+		"""
+		Rotate the k front elements to the back of the queue (the k back elements to the front if k is negative).
+		Only the tail pointer moves: it advances k % len(self) nodes, as the links only run forwards.
+		"""
 		if self._size > 0:
-			self._tail = self._tail._next
+			tail = self._tail
+			for _ in range(k % self._size):
+				tail = tail._next
+			self._tail = tail
 
 
 class _DoublyLinkedBase:
@@ -184,8 +312,8 @@ class _DoublyLinkedBase:
 		# _header and _trailer are the two sentinel nodes at the start and the end of the linked list
 		self._header = self._Node(None, None, None)
 		self._trailer = self._Node(None, None, None)
-		self._header._prev = self._trailer
-		self._trailer._next = self._header
+		self._header._next = self._trailer
+		self._trailer._prev = self._header
 		self._size = 0  # Initial size is 0: _header and _trailer are not acknowledged as real elements of the list
 
 	def __len__(self):
@@ -216,12 +344,31 @@ class _DoublyLinkedBase:
 		self._size -= 1
 		# Successfully unlinked the node
 		element = node._element
-		node._next = node._element = node._element = None  # Garbage collect/cleanup the unliked node
+		node._prev = node._next = node._element = None  # Garbage collect/cleanup the unliked node
 		return element
 
 
 class LinkedDeque(_DoublyLinkedBase):
-	"""Double-ended queue(deque) implementation based off a doubly linked list"""
+	"""
+	Double-ended queue(deque) implementation based off a doubly linked list
+	LinkedDeque(unrolled=True) returns the same deque stored in blocks of block_size elements per node instead
+	(see _UnrolledChain).
+	"""
+
+	def __new__(cls, unrolled = False, block_size = 64):
+		if cls is LinkedDeque and unrolled:
+			cls = _UnrolledLinkedDeque
+		return super().__new__(cls)
+
+	def __init__(self, unrolled = False, block_size = 64):
+		super().__init__()
+
+	def __iter__(self):
+		"""Generate the elements from front to back"""
+		walk = self._header._next
+		while walk is not self._trailer:
+			yield walk._element
+			walk = walk._next
 
 	def first(self):
 		"""Return(But do not remove) the element at the front of the deque"""
@@ -256,17 +403,202 @@ class LinkedDeque(_DoublyLinkedBase):
 		return self._delete_node(self._header._next)
 
 
+class _Block:
+	"""A non-public node of an unrolled linked list holding a fixed-size run of element slots"""
+	__slots__ = '_items', '_prev', '_next'
+
+	def __init__(self, size, prev, next):
+		self._items = [None] * size
+		self._prev = prev
+		self._next = next
+
+
+class _UnrolledChain:
+	"""
+	Deque storage as a doubly linked list of _Block nodes, each holding block_size elements, like the blocks of
+	collections.deque. Elements fill the left block from _lo up and the right block up to _hi, so pushing or
+	popping at either end is an index update plus, once every block_size operations, linking or unlinking a block.
+	One unlinked block is kept as a spare so a queue oscillating across a block boundary does not reallocate.
+	Iteration walks block by block, slicing each run instead of following one pointer per element.
+	"""
+	_empty_message = 'Queue is empty'
+
+	def __init__(self, block_size = 64):
+		if block_size < 2:
+			raise ValueError('block_size must be at least 2')
+		self._block_size = block_size
+		self._left = self._right = _Block(block_size, None, None)
+		self._lo = self._hi = block_size // 2  # Slots [_lo, block end) of _left and [0, _hi) of _right are used
+		self._spare = None
+		self._size = 0
+
+	def __len__(self):
+		return self._size
+
+	def is_empty(self):
+		return self._size == 0
+
+	def __iter__(self):
+		return itertools.chain.from_iterable(self._runs())
+
+	def _runs(self):
+		"""Generate the used slice of every block from left to right"""
+		block, lo = self._left, self._lo
+		while block is not self._right:
+			yield block._items[lo:]
+			block, lo = block._next, 0
+		yield block._items[lo:self._hi]
+
+	def _block(self, prev, next):
+		"""Return a new block, reusing the spare one if there is any"""
+		block = self._spare
+		if block is None:
+			return _Block(self._block_size, prev, next)
+		self._spare = None
+		block._prev = prev
+		block._next = next
+		return block
+
+	def _recentre(self):
+		"""Start over from the middle of the single remaining block once the chain is empty"""
+		self._lo = self._hi = self._block_size // 2
+
+	def _peek_first(self):
+		if self._size == 0:
+			raise Empty(self._empty_message)
+		return self._left._items[self._lo]
+
+	def _peek_last(self):
+		if self._size == 0:
+			raise Empty(self._empty_message)
+		return self._right._items[self._hi - 1]
+
+	def _push_last(self, e):
+		hi = self._hi
+		if hi == self._block_size:
+			self._right._next = self._right = self._block(self._right, None)
+			hi = 0
+		self._right._items[hi] = e
+		self._hi = hi + 1
+		self._size += 1
+
+	def _push_first(self, e):
+		lo = self._lo
+		if lo == 0:
+			self._left._prev = self._left = self._block(None, self._left)
+			lo = self._block_size
+		lo -= 1
+		self._left._items[lo] = e
+		self._lo = lo
+		self._size += 1
+
+	def _pop_first(self):
+		if self._size == 0:
+			raise Empty(self._empty_message)
+		block, lo = self._left, self._lo
+		e = block._items[lo]
+		block._items[lo] = None
+		self._size -= 1
+		lo += 1
+		if self._size == 0:
+			self._recentre()
+		elif lo == self._block_size:  # The left block is used up: unlink it and keep it as the spare
+			self._left = block._next
+			self._left._prev = block._next = None
+			self._spare = block
+			self._lo = 0
+		else:
+			self._lo = lo
+		return e
+
+	def _pop_last(self):
+		if self._size == 0:
+			raise Empty(self._empty_message)
+		block = self._right
+		hi = self._hi - 1
+		e = block._items[hi]
+		block._items[hi] = None
+		self._size -= 1
+		if self._size == 0:
+			self._recentre()
+		elif hi == 0:  # The right block is used up: unlink it and keep it as the spare
+			self._right = block._prev
+			self._right._next = block._prev = None
+			self._spare = block
+			self._hi = self._block_size
+		else:
+			self._hi = hi
+		return e
+
+
+class _UnrolledLinkedQueue(_UnrolledChain, LinkedQueue):
+	"""LinkedQueue stored in an unrolled linked list. pool_size is ignored: blocks are recycled instead"""
+
+	def __init__(self, pool_size = 0, unrolled = True, block_size = 64):
+		_UnrolledChain.__init__(self, block_size)
+
+	first = _UnrolledChain._peek_first
+	enqueue = _UnrolledChain._push_last
+	dequeue = _UnrolledChain._pop_first
+
+
+class _UnrolledLinkedDeque(_UnrolledChain, LinkedDeque):
+	"""LinkedDeque stored in an unrolled linked list"""
+	_empty_message = 'Deque is empty'
+
+	def __init__(self, unrolled = True, block_size = 64):
+		_UnrolledChain.__init__(self, block_size)
+
+	first = _UnrolledChain._peek_first
+	last = _UnrolledChain._peek_last
+	insert_first = _UnrolledChain._push_first
+	insert_last = _UnrolledChain._push_last
+	delete_first = _UnrolledChain._pop_first
+	delete_last = _UnrolledChain._pop_last
+
+
+class _Owner:
+	"""
+	Union-find cell identifying the list a group of nodes belongs to. Positions refer to the cell of the list that
+	created them rather than to the list itself, so when PositionalList.splice or merge moves every node of a list
+	into another, re-parenting one cell hands all of the moved Positions over without visiting them.
+	"""
+	__slots__ = '_parent'
+
+	def __init__(self):
+		self._parent = None
+
+	def root(self):
+		"""Return the cell of the list that currently owns the nodes, compressing the path to it"""
+		root = self
+		while root._parent is not None:
+			root = root._parent
+		walk = self
+		while walk is not root:
+			walk._parent, walk = root, walk._parent
+		return root
+
+
 class PositionalList(_DoublyLinkedBase):
-	"""A sequential container of elements allowing positional access"""
+	"""
+	A sequential container of elements allowing positional access
+	PositionalList(indexed=True) returns a list that also keeps an order-statistics tree over its nodes, making
+	at(k), rank(p) and slice(i, j) logarithmic instead of linear walks.
+	"""
+
+	def __new__(cls, indexed = False):
+		if cls is PositionalList and indexed:
+			cls = _IndexedPositionalList
+		return super().__new__(cls)
 
 	# ------------- nested Position class ------------------
 	class Position:
 		"""An Abstraction representing the location of a single node in the list"""
-		# __slots__ = '_container', 'node'
+		__slots__ = '_container', '_node'
 
 		def __init__(self, container, node):
 			"""Create new position. This Constructor should not be invoked by the user to abstract node access"""
-			self._container = container
+			self._container = container._owner  # Followed to the current owner when the node is spliced elsewhere
 			self._node = node
 
 		def element(self):
@@ -281,12 +613,17 @@ class PositionalList(_DoublyLinkedBase):
 			"""Return True if other object does not represent the same location"""
 			return not(self == other)
 
+	def __init__(self, indexed = False):
+		"""Creates an empty list"""
+		super().__init__()
+		self._owner = _Owner()
+
 	# ----------------------- Utility methods -----------------------
 	def _validate(self, p):
 		"""Returns position's node or return appropriate error if invalid"""
 		if not isinstance(p, self.Position):
 			raise TypeError('P must be of type Position')
-		if p._container is not self:
+		if p._container is not self._owner and p._container.root() is not self._owner:
 			raise ValueError('P does not belong to this container')
 		if p._node._next is None:  # This node is a sentinel(trailer) or has been deprecated
 			raise ValueError('P is not valid')
@@ -318,12 +655,93 @@ class PositionalList(_DoublyLinkedBase):
 		node = self._validate(p)
 		return self._make_position(node._next)
 
+	def _nodes(self, reverse = False):
+		"""
+		Generate the nodes from front to back (back to front if reverse), walking the links directly.
+		The next node is fetched before yielding, so the current one may be deleted meanwhile.
+		"""
+		if reverse:
+			walk, end = self._trailer._prev, self._header
+			while walk is not end:
+				step = walk._prev
+				yield walk
+				walk = step
+		else:
+			walk, end = self._header._next, self._trailer
+			while walk is not end:
+				step = walk._next
+				yield walk
+				walk = step
+
+	def elements(self, reverse = False):
+		"""Generate the elements in the list without creating a Position for any of them"""
+		if reverse:
+			walk, end = self._trailer._prev, self._header
+			while walk is not end:
+				yield walk._element
+				walk = walk._prev
+		else:
+			walk, end = self._header._next, self._trailer
+			while walk is not end:
+				yield walk._element
+				walk = walk._next
+
+	def positions(self, reverse = False):
+		"""Generate the Position of each element in the list, created only as it is reached"""
+		for node in self._nodes(reverse):
+			yield self.Position(self, node)
+
 	def __iter__(self):
 		"""Generate a forward iteration on elements in the list"""
-		cursor = self.first()
-		while cursor is not None:
-			yield cursor.element()
-			cursor = self.after(cursor)
+		return self.elements()
+
+	def __reversed__(self):
+		"""Generate a backward iteration on elements in the list"""
+		return self.elements(reverse = True)
+
+	def _index(self, k):
+		"""Return k as a non-negative index, counting from the back if negative, or raise IndexError"""
+		if k < 0:
+			k += self._size
+		if not 0 <= k < self._size:
+			raise IndexError('list index out of range')
+		return k
+
+	def _node_at(self, k):
+		"""Return the node at index k, walking from the nearer end"""
+		if k < self._size // 2:
+			walk = self._header._next
+			for _ in range(k):
+				walk = walk._next
+		else:
+			walk = self._trailer._prev
+			for _ in range(self._size - 1 - k):
+				walk = walk._prev
+		return walk
+
+	def at(self, k):
+		"""Return the Position of the k-th element (negative k counts from the back)"""
+		return self._make_position(self._node_at(self._index(k)))
+
+	def rank(self, p):
+		"""Return the index of Position p in the list"""
+		walk, k = self._validate(p), 0
+		while walk._prev is not self._header:
+			walk = walk._prev
+			k += 1
+		return k
+
+	def slice(self, i, j):
+		"""Return the list of elements from index i up to (not including) j, with the clamping of list slicing"""
+		i, j, _ = slice(i, j).indices(self._size)
+		if i >= j:
+			return []
+		walk = self._node_at(i)
+		elements = []
+		for _ in range(j - i):
+			elements.append(walk._element)
+			walk = walk._next
+		return elements
 
 	# -------------------- Mutators ------------------------
 	# Override inherited methods to return Position rather than Nodes
@@ -364,6 +782,391 @@ class PositionalList(_DoublyLinkedBase):
 		original._element = e
 		return value
 
+	# -------------------- Bulk operations ------------------------
+	def _adopt(self, other):
+		"""Take over the Positions of other, whose nodes have all been linked into this list, and empty other"""
+		self._size += other._size
+		other._owner._parent = self._owner
+		other._owner = _Owner()
+		other._header._next = other._trailer
+		other._trailer._prev = other._header
+		other._size = 0
+
+	def _check_other(self, other):
+		if other is self:
+			raise ValueError('Cannot combine a list with itself')
+		if type(other) is not type(self):
+			raise TypeError('other must be a PositionalList of the same kind (indexed or not)')
+
+	def splice(self, p, other):
+		"""
+		Move every node of other before Position p (at the back if p is None) in O(1), leaving other empty.
+		Nothing is copied: the two chains are relinked, and Positions of other's elements stay valid in this list.
+		"""
+		self._check_other(other)
+		successor = self._trailer if p is None else self._validate(p)
+		if other._size == 0:
+			return
+		first, last = other._header._next, other._trailer._prev
+		predecessor = successor._prev
+		predecessor._next = first
+		first._prev = predecessor
+		last._next = successor
+		successor._prev = last
+		self._adopt(other)
+
+	def extend(self, iterable):
+		"""Append the elements of iterable at the back, linking the new nodes in one pass"""
+		node = self._trailer._prev
+		count = 0
+		try:
+			for e in iterable:
+				node._next = node = self._Node(e, node, None)
+				count += 1
+		finally:  # Close the chain even if iterable fails part way through
+			node._next = self._trailer
+			self._trailer._prev = node
+			self._size += count
+
+	def _relink(self, nodes):
+		"""Link the nodes between the sentinels in the given order"""
+		prev = self._header
+		for node in nodes:
+			prev._next = node
+			node._prev = prev
+			prev = node
+		prev._next = self._trailer
+		self._trailer._prev = prev
+
+	def sort(self, key = None, reverse = False):
+		"""
+		Stable sort of the list in place. The nodes themselves are reordered (by Python's merge-based Timsort over
+		an array of node references), so no element is copied and every existing Position stays valid.
+		"""
+		nodes = list(self._nodes())
+		if key is None:
+			nodes.sort(key = lambda node: node._element, reverse = reverse)
+		else:
+			nodes.sort(key = lambda node: key(node._element), reverse = reverse)
+		self._relink(nodes)
+
+	def merge(self, other, key = None):
+		"""
+		Merge the nodes of other, a list sorted by the same key, into this sorted list in one linear pass, leaving
+		other empty. The merge is stable (on ties this list's elements come first) and Positions stay valid.
+		"""
+		self._check_other(other)
+		key = key or (lambda e: e)
+		a, b = self._header._next, other._header._next
+		a_end, b_end = self._trailer, other._trailer
+		tail = self._header
+		while a is not a_end and b is not b_end:
+			if key(b._element) < key(a._element):
+				tail._next, b._prev, tail, b = b, tail, b, b._next
+			else:
+				tail._next, a._prev, tail, a = a, tail, a, a._next
+		if a is not a_end:  # The rest of this list is still linked up to its trailer
+			tail._next, a._prev = a, tail
+		else:
+			if b is not b_end:  # Link the rest of other's chain, then close it at this list's trailer
+				tail._next, b._prev = b, tail
+				tail = b_end._prev
+			tail._next = a_end
+			a_end._prev = tail
+		self._adopt(other)
+
+
+def _count(t):
+	"""Number of nodes in the tree rooted at t"""
+	return t._count if t is not None else 0
+
+
+class _IndexedPositionalList(PositionalList):
+	"""
+	PositionalList with an order-statistics layer: every node is also a node of a treap (a binary search tree by
+	list order, heap-ordered by random priorities so its expected depth is O(log n)) whose nodes count their
+	subtree. rank walks up from a node, at and slice walk down from the root, both in O(log n).
+	A single insertion attaches the new node as a leaf next to its list neighbour and rotates it up; a deletion
+	rotates the node down to a leaf and detaches it. splice and extend split and join treaps in O(log n)
+	(plus O(m) to build the m extended nodes); sort and merge, which reorder everything, rebuild it in O(n).
+	"""
+
+	class _Node(_DoublyLinkedBase._Node):
+		"""A list node that is also a treap node"""
+		__slots__ = '_left', '_right', '_up', '_count', '_priority'
+
+		def __init__(self, element, prev, next):
+			super().__init__(element, prev, next)
+			self._left = self._right = self._up = None
+			self._count = 1
+			self._priority = random.random()
+
+	def __init__(self, indexed = True):
+		super().__init__()
+		self._root = None
+
+	# ----------------------- Treap maintenance -----------------------
+	def _rotate_up(self, x):
+		"""Rotate x above its parent, keeping the list order and the subtree counts"""
+		y = x._up
+		z = y._up
+		if y._left is x:
+			b = y._left = x._right
+			x._right = y
+		else:
+			b = y._right = x._left
+			x._left = y
+		if b is not None:
+			b._up = y
+		y._up = x
+		x._up = z
+		if z is None:
+			self._root = x
+		elif z._left is y:
+			z._left = x
+		else:
+			z._right = x
+		x._count = y._count
+		y._count = 1 + _count(y._left) + _count(y._right)
+
+	def _tree_insert(self, node, predecessor, successor):
+		"""Add a node just linked between predecessor and successor to the treap"""
+		if self._root is None:
+			self._root = node
+			return
+		# Of two neighbours in list order, one is an ancestor of the other, so one of these slots is free
+		if successor is not self._trailer and successor._left is None:
+			successor._left = node
+			parent = successor
+		else:
+			predecessor._right = node
+			parent = predecessor
+		node._up = walk = parent
+		while walk is not None:
+			walk._count += 1
+			walk = walk._up
+		while node._up is not None and node._up._priority < node._priority:
+			self._rotate_up(node)
+
+	def _tree_delete(self, node):
+		"""Remove a node from the treap before it is unlinked from the list"""
+		while node._left is not None or node._right is not None:
+			if node._right is None or (node._left is not None and node._left._priority > node._right._priority):
+				self._rotate_up(node._left)
+			else:
+				self._rotate_up(node._right)
+		parent = node._up
+		if parent is None:
+			self._root = None
+		else:
+			if parent._left is node:
+				parent._left = None
+			else:
+				parent._right = None
+			while parent is not None:
+				parent._count -= 1
+				parent = parent._up
+		node._up = None
+
+	@staticmethod
+	def _build(nodes):
+		"""Build a treap over nodes (in list order) in O(n) with a stack, returning its root"""
+		stack = []
+		for node in nodes:
+			node._priority = random.random()
+			node._up = node._right = None
+			last = None
+			while stack and stack[-1]._priority < node._priority:
+				last = stack.pop()
+				last._count = 1 + _count(last._left) + _count(last._right)
+			node._left = last
+			if last is not None:
+				last._up = node
+			if stack:
+				stack[-1]._right = node
+				node._up = stack[-1]
+			stack.append(node)
+		root = stack[0] if stack else None
+		while stack:
+			last = stack.pop()
+			last._count = 1 + _count(last._left) + _count(last._right)
+		return root
+
+	@classmethod
+	def _split(cls, t, k):
+		"""Split the treap t into the trees of its first k nodes and of the rest"""
+		if t is None:
+			return None, None
+		if k <= _count(t._left):
+			left, rest = cls._split(t._left, k)
+			t._left = rest
+			if rest is not None:
+				rest._up = t
+			t._count = 1 + _count(rest) + _count(t._right)
+			if left is not None:
+				left._up = None
+			t._up = None
+			return left, t
+		rest, right = cls._split(t._right, k - _count(t._left) - 1)
+		t._right = rest
+		if rest is not None:
+			rest._up = t
+		t._count = 1 + _count(t._left) + _count(rest)
+		if right is not None:
+			right._up = None
+		t._up = None
+		return t, right
+
+	@classmethod
+	def _join(cls, a, b):
+		"""Join two treaps, all of a's nodes coming before b's in the list, and return the root"""
+		if a is None:
+			return b
+		if b is None:
+			return a
+		if a._priority > b._priority:
+			a._right = child = cls._join(a._right, b)
+			child._up = a
+			a._count = 1 + _count(a._left) + _count(child)
+			return a
+		b._left = child = cls._join(a, b._left)
+		child._up = b
+		b._count = 1 + _count(child) + _count(b._right)
+		return b
+
+	def _set_root(self, root):
+		if root is not None:
+			root._up = None
+		self._root = root
+
+	def _node_rank(self, node):
+		k = _count(node._left)
+		while node._up is not None:
+			if node._up._right is node:
+				k += _count(node._up._left) + 1
+			node = node._up
+		return k
+
+	# ----------------------- Overrides -----------------------
+	def _insert_between(self, e, predecessor, successor):
+		position = super()._insert_between(e, predecessor, successor)
+		self._tree_insert(position._node, predecessor, successor)
+		return position
+
+	def _delete_node(self, node):
+		self._tree_delete(node)
+		node._left = node._right = None
+		return super()._delete_node(node)
+
+	def _node_at(self, k):
+		walk = self._root
+		while True:
+			left = _count(walk._left)
+			if k < left:
+				walk = walk._left
+			elif k == left:
+				return walk
+			else:
+				k -= left + 1
+				walk = walk._right
+
+	def rank(self, p):
+		return self._node_rank(self._validate(p))
+
+	def splice(self, p, other):
+		self._check_other(other)
+		k = self._size if p is None else self._node_rank(self._validate(p))
+		moved = other._root
+		super().splice(p, other)
+		other._root = None
+		left, right = self._split(self._root, k)
+		self._set_root(self._join(self._join(left, moved), right))
+
+	def extend(self, iterable):
+		last = self._trailer._prev
+		try:
+			super().extend(iterable)
+		finally:
+			added = []
+			walk = last._next
+			while walk is not self._trailer:
+				added.append(walk)
+				walk = walk._next
+			self._set_root(self._join(self._root, self._build(added)))
+
+	def _relink(self, nodes):
+		super()._relink(nodes)
+		self._set_root(self._build(nodes))
+
+	def merge(self, other, key = None):
+		super().merge(other, key)
+		other._root = None
+		self._set_root(self._build(list(self._nodes())))
+
+
+def _profile(factory, insert, remove, count, burst):
+	"""
+	Return (bytes per element, operations per second, elements iterated per second) of a linked structure.
+	Bytes are the traced allocations of a structure holding count elements; operations are bursts of burst
+	insertions followed by as many removals.
+	"""
+	elements = list(range(count))  # Allocated up front so that only the structure itself is traced
+	tracemalloc.start()
+	structure = factory()
+	add = getattr(structure, insert)
+	for e in elements:
+		add(e)
+	size = tracemalloc.get_traced_memory()[0]
+	tracemalloc.stop()
+	scan = None
+	if hasattr(structure, '__iter__'):
+		began = time.perf_counter()
+		for _ in structure:
+			pass
+		scan = time.perf_counter() - began
+	del structure
+	structure = factory()
+	add, take = getattr(structure, insert), getattr(structure, remove)
+	batch = elements[:burst]
+	began = time.perf_counter()
+	for _ in range(count // burst):
+		for e in batch:
+			add(e)
+		for _ in batch:
+			take()
+	elapsed = time.perf_counter() - began
+	return size / count, 2 * burst * (count // burst) / elapsed, scan and count / scan
+
+
+def benchmark_nodes(count = 100000, burst = 1000):
+	"""Report bytes per element and operations per second for every linked structure"""
+	cases = [
+		('LinkedStack', LinkedStack, 'push', 'pop'),
+		('LinkedQueue', LinkedQueue, 'enqueue', 'dequeue'),
+		('LinkedQueue(pool_size={0})'.format(burst), lambda: LinkedQueue(burst), 'enqueue', 'dequeue'),
+		('CircularQueue', CircularQueue, 'enqueue', 'dequeue'),
+		('CircularQueue(pool_size={0})'.format(burst), lambda: CircularQueue(burst), 'enqueue', 'dequeue'),
+		('LinkedDeque', LinkedDeque, 'insert_last', 'delete_first'),
+	]
+	for name, factory, insert, remove in cases:
+		per_element, ops, _ = _profile(factory, insert, remove, count, burst)
+		print('{0:<30}{1:>8.1f} bytes/element{2:>12.0f} ops/s'.format(name, per_element, ops))
+
+
+def benchmark_unrolled(count = 1000000, burst = 1000):
+	"""Compare the node and unrolled backends of LinkedQueue and LinkedDeque with collections.deque"""
+	cases = [
+		('LinkedQueue', LinkedQueue, 'enqueue', 'dequeue'),
+		('LinkedQueue(unrolled=True)', lambda: LinkedQueue(unrolled = True), 'enqueue', 'dequeue'),
+		('LinkedDeque', LinkedDeque, 'insert_last', 'delete_first'),
+		('LinkedDeque(unrolled=True)', lambda: LinkedDeque(unrolled = True), 'insert_last', 'delete_first'),
+		('collections.deque', collections.deque, 'append', 'popleft'),
+	]
+	for name, factory, insert, remove in cases:
+		per_element, ops, scan = _profile(factory, insert, remove, count, burst)
+		print('{0:<30}{1:>8.1f} bytes/element{2:>12.0f} ops/s{3:>14.0f} iterated/s'.format(
+			name, per_element, ops, scan))
+
 
 if __name__ == '__main__':
 	ls = LinkedStack()
@@ -371,3 +1174,60 @@ if __name__ == '__main__':
 		ls.push(i)
 	print(ls.top)  # Current head
 	print(ls.pop())
+	other = LinkedStack()
+	other.push_many(range(10, 13))
+	ls.splice(other)
+	assert len(ls) == 7 and ls.top() == 12 and other.is_empty()
+	ls.transfer_reversed(other)
+	assert [other.pop() for _ in range(7)] == [0, 1, 2, 3, 10, 11, 12] and ls.is_empty()
+
+	lq = LinkedQueue(pool_size = 2)
+	for i in range(4):
+		lq.enqueue(i)
+	assert [lq.dequeue() for _ in range(4)] == [0, 1, 2, 3] and lq._free_count == 2, 'Should keep at most 2 nodes'
+	lq.enqueue(4)
+	assert lq.first() == 4 and lq._free_count == 1, 'Should reuse a pooled node'
+	cq = CircularQueue(pool_size = 1)
+	for i in range(3):
+		cq.enqueue(i)
+	cq.rotate()
+	assert [cq.dequeue() for _ in range(3)] == [1, 2, 0] and cq._free._element is None
+	deque = LinkedDeque()
+	deque.insert_last(1)
+	deque.insert_first(0)
+	assert deque.first() == 0 and deque.delete_last() == 1 and len(deque) == 1
+	benchmark_nodes()
+	unrolled = LinkedDeque(unrolled = True, block_size = 4)
+	for i in range(10):
+		unrolled.insert_last(i)
+		unrolled.insert_first(-i)
+	assert list(unrolled) == list(range(-9, 1)) + list(range(10)) and unrolled.delete_last() == 9
+
+	plist = PositionalList()
+	for i in range(5):
+		plist.add_last(i)
+	assert list(plist) == [0, 1, 2, 3, 4] and list(reversed(plist)) == [4, 3, 2, 1, 0]
+	for position in plist.positions():
+		if position.element() % 2:
+			plist.delete(position)
+	assert list(plist.elements(reverse = True)) == [4, 2, 0], 'Should allow deleting the current position'
+	timeline, late = PositionalList(), PositionalList()
+	timeline.extend([5, 1, 4])
+	marker = late.add_last(3)
+	late.add_last(2)
+	timeline.splice(timeline.last(), late)
+	assert list(timeline) == [5, 1, 3, 2, 4] and late.is_empty() and timeline.after(marker).element() == 2
+	timeline.sort()
+	assert list(timeline) == [1, 2, 3, 4, 5] and timeline.before(marker).element() == 2, 'Should keep Positions valid'
+	tail = PositionalList()
+	tail.extend([0, 3, 6])
+	timeline.merge(tail)
+	assert list(timeline) == [0, 1, 2, 3, 3, 4, 5, 6] and len(timeline) == 8
+	pages = PositionalList(indexed = True)
+	pages.extend(range(0, 100, 10))
+	middle = pages.add_before(pages.at(5), 45)
+	assert pages.rank(middle) == 5 and pages.at(-1).element() == 90 and pages.slice(4, 7) == [40, 45, 50]
+	pages.delete(pages.first())
+	pages.replace(middle, 44)
+	assert pages.rank(middle) == 4 and pages.slice(-2, None) == [80, 90] and len(pages) == 10
+	benchmark_unrolled()
@@ -1,4 +1,8 @@
 """The queue Abstract Data Structure"""
+import asyncio
+import collections
+import threading
+import time
 from typing import List
 
 
@@ -7,15 +11,64 @@ class Empty(Exception):
 	pass
 
 
-class Queue:
-	"""Queue FIFO Implementation using underlying python list storage"""
-	DEFAULT_CAPACITY = 10
+class Full(Exception):
+	"""Full bounded queue error"""
+	pass
 
-	def __init__(self,):
-		"""Create an empty queue instance"""
-		self._data = [None] * Queue.DEFAULT_CAPACITY
-		self._front = 0
+
+class ResizePolicy(collections.namedtuple('ResizePolicy', 'grow shrink_below min_capacity')):
+	"""
+	Capacity hysteresis of the ring buffer queues.
+	A full buffer grows by the factor grow (a power of two). Once fewer than capacity * shrink_below elements are
+	left, the capacity is divided by grow, but never below min_capacity (rounded up to a power of two);
+	shrink_below = 0 never shrinks. shrink_below * grow must stay below 1 so that a shrunk buffer is never full
+	again straight away: the gap between the two thresholds is what absorbs bursts without resize thrashing.
+	"""
+	__slots__ = ()
+
+	def __new__(cls, grow = 2, shrink_below = 0.25, min_capacity = 16):
+		if grow < 2 or grow & (grow - 1):
+			raise ValueError('grow must be a power of two >= 2')
+		if not 0 <= shrink_below * grow < 1:
+			raise ValueError('shrink_below must be between 0 and 1 / grow')
+		if min_capacity < 1:
+			raise ValueError('min_capacity must be positive')
+		return super().__new__(cls, grow, shrink_below, 1 << (min_capacity - 1).bit_length())
+
+
+DEFAULT_POLICY = ResizePolicy()
+
+
+class _RingBuffer:
+	"""
+	Circular array storage shared by Queue and ArrayDeque.
+	The capacity is always a power of two, so a slot index wraps around with a bitmask (i & mask) instead of a
+	modulo, and resizing moves the elements with at most two slice copies. When it grows and shrinks is set by a
+	ResizePolicy.
+	"""
+	__slots__ = ('_data', '_front', '_size', '_mask', '_policy', '_shrink_at', '_resizes', '_copies')
+	DEFAULT_CAPACITY = DEFAULT_POLICY.min_capacity
+
+	def __init__(self, policy = None):
+		self._policy = policy = policy or DEFAULT_POLICY
+		self._data = [None] * policy.min_capacity
+		self._front = 0  # Slot of the first element
 		self._size = 0
+		self._mask = policy.min_capacity - 1
+		self._shrink_at = 0  # Size below which the buffer shrinks; 0 at the minimum capacity
+		self._resizes = 0
+		self._copies = 0
+
+	def stats(self):
+		"""Return capacity and resize telemetry for tuning the ResizePolicy"""
+		return {
+			'size': self._size,
+			'capacity': len(self._data),
+			'load_factor': self._size / len(self._data),
+			'resizes': self._resizes,
+			'elements_copied': self._copies,
+			'policy': self._policy,
+		}
 
 	def __len__(self):
 		"""Return the actual length of contents inside the queue"""
@@ -25,9 +78,69 @@ class Queue:
 		"""Return True if the queue is empty"""
 		return self._size == 0
 
+	def _reserve(self, n):
+		"""Grow the capacity, once, to the smallest power of two that holds n elements"""
+		if n > len(self._data):
+			self._resize(1 << (n - 1).bit_length())
+
+	def _write_run(self, start, items):
+		"""Copy items into the slots from start onwards, wrapping around the end of the list (two slice copies)"""
+		data = self._data
+		head = min(len(items), len(data) - start)
+		data[start:start + head] = items[:head]
+		data[:len(items) - head] = items[head:]
+
+	def _clear_run(self, start, count):
+		"""Release the references held by count slots from start onwards, wrapping around the end of the list"""
+		data = self._data
+		head = min(count, len(data) - start)
+		data[start:start + head] = [None] * head
+		data[:count - head] = [None] * (count - head)
+
+	def _resize(self, cap):
+		"""Move the elements, re-aligned at slot 0, to a new list of capacity cap (a power of two >= len(self))"""
+		old = self._data
+		front, size = self._front, self._size
+		data = [None] * cap
+		end = front + size
+		if end <= len(old):
+			data[:size] = old[front:end]
+		else:  # The elements wrap around the end of the old list: copy the front run, then the wrapped run
+			head = len(old) - front
+			data[:head] = old[front:]
+			data[head:size] = old[:end - len(old)]
+		self._data = data
+		self._front = 0  # Front has been re-aligned
+		self._mask = cap - 1
+		self._resizes += 1
+		self._copies += size
+		self._shrink_at = 0 if cap <= self._policy.min_capacity else int(cap * self._policy.shrink_below)
+
+	def _grow(self):
+		self._resize(len(self._data) * self._policy.grow)
+
+	def _shrink(self):
+		self._resize(max(len(self._data) // self._policy.grow, self._policy.min_capacity))
+
+	def _reset(self):
+		"""Drop every element, going back to the minimum capacity"""
+		self._data = [None] * self._policy.min_capacity
+		self._front = 0
+		self._size = 0
+		self._mask = self._policy.min_capacity - 1
+		self._shrink_at = 0
+
+
+class Queue(_RingBuffer):
+	"""
+	Queue FIFO Implementation using underlying python list storage
+	Queue(policy) sets the ResizePolicy of the underlying ring buffer.
+	"""
+	__slots__ = ()
+
 	def first(self):
 		"""Return (Does not Remove) the first element in-front of the queue"""
-		if self.is_empty():
+		if self._size == 0:
 			raise Empty('Queue is empty!')
 		return self._data[self._front]
 
@@ -35,137 +148,558 @@ class Queue:
 		"""Remove and return the first element in the queue
 		Raise Empty Error if queue is empty
 		"""
-		if self.is_empty():
+		if self._size == 0:
 			raise Empty('Empty queue')
-		front = self._data[self._front]
-		self._data[self._front] = None  # Assign new empty index to None
-		self._front = (self._front + 1) % len(self._data)  # Point the new front index by applying  n = (n+1) % len
-		# for the circular array semantics
+		data = self._data
+		front = self._front
+		element = data[front]
+		data[front] = None  # Assign new empty index to None
+		self._front = (front + 1) & self._mask  # Point the new front index, wrapping around the circular array
 		self._size -= 1
-		if 0 < self._size < len(self._data) // 4:
-			# Efficient resizing technique: If size is less than a quarter of
-			# available space then resize the whole queue capacity by half
-			self._resize(len(self._data) // 2)
-		return front
+		if self._size < self._shrink_at:
+			# Efficient resizing technique: once the size falls below the policy's share of the
+			# available space (a quarter by default) divide the capacity by the growth factor
+			self._shrink()
+		return element
 
 	def enqueue(self, element):
 		"""Insert an element at the end of a queue"""
-		if len(self._data) == self._size:
-			# Double size since there is no enough space for a new element
-			self._resize(2*len(self._data))  # Double array size
-		avail = (self._front + self._size) % len(self._data)
-		self._data[avail] = element
-		self._size += 1
-
-	def _resize(self, cap):
-		"""Resize to a new list of capacity  => len(self)"""
-		old = self._data
-		self._data = [None] * cap  # Create the new list with the appropriate capacity
-		walk = self._front  # First element index
-		for k in range(self._size):  # Only consider the existing elements since actual size => self._size
-			self._data[k] = old[walk]     # Append elements in new _data from old data shifting their indices
-			walk = (walk + 1) % len(old)  # Use old size as modulus
-		self._front = 0  # Front has been re-aligned
-
+		size = self._size
+		if size > self._mask:
+			# Double size (by default) since there is no enough space for a new element
+			self._grow()
+		self._data[(self._front + size) & self._mask] = element
+		self._size = size + 1
 
-class ArrayDeque:
-	"""Double-ended Queue(deque) Implementation Allowing insert and delete from both front and end of the queue"""
 
-	DEFAULT_QUEUE_SIZE = 10
+class ArrayDeque(_RingBuffer):
+	"""
+	Double-ended Queue(deque) Implementation Allowing insert and delete from both front and end of the queue
+	With a maxlen the deque is a sliding window: once full, adding at one end drops an element from the other.
+	"""
+	__slots__ = ('_maxlen', '_mutations')
 
-	def __init__(self):
-		"""Creates empty deque"""
-		self._data = [None] * self.DEFAULT_QUEUE_SIZE
-		self._front = 0
-		self._size = 0
+	def __init__(self, iterable = (), maxlen = None, policy = None):
+		"""
+		Creates a deque holding the elements of iterable, bounded to maxlen elements if given.
+		policy is the ResizePolicy of the underlying ring buffer.
+		"""
+		if maxlen is not None and maxlen < 0:
+			raise ValueError('maxlen must be non-negative')
+		super().__init__(policy)
+		self._maxlen = maxlen
+		self._mutations = 0  # Bumped by every mutator so that live iterators notice, like collections.deque
+		if iterable:
+			self.extend(iterable)
 
-	def __len__(self):
-		"""Returns the size of the queue"""
-		return self._size
+	@property
+	def maxlen(self):
+		"""Maximum size of the deque, or None if unbounded"""
+		return self._maxlen
 
 	def __repr__(self):
 		"""Outputs a formatted representation of the deque"""
-		return str(self._data)
+		if self._maxlen is None:
+			return 'ArrayDeque({0})'.format(list(self))
+		return 'ArrayDeque({0}, maxlen={1})'.format(list(self), self._maxlen)
 
-	def is_empty(self):
-		"""Returns True if the queue is empty"""
-		return self._size == 0
+	def __getitem__(self, i):
+		"""Return the element at logical index i (negative indices count from the back) in O(1)"""
+		size = self._size
+		if i < 0:
+			i += size
+		if not 0 <= i < size:
+			raise IndexError('deque index out of range')
+		return self._data[(self._front + i) & self._mask]
+
+	def _iterate(self, indices):
+		"""Yield the elements at the given logical indices, failing if the deque is modified meanwhile"""
+		data, front, mask, mutations = self._data, self._front, self._mask, self._mutations
+		for i in indices:
+			# Comparing front and size alone misses a pop followed by a push at the same end
+			if self._mutations != mutations:
+				raise RuntimeError('deque mutated during iteration')
+			yield data[(front + i) & mask]
+
+	def __iter__(self):
+		"""Lazily yield the elements from front to back"""
+		return self._iterate(range(self._size))
+
+	def __reversed__(self):
+		"""Lazily yield the elements from back to front"""
+		return self._iterate(range(self._size - 1, -1, -1))
+
+	def clear(self):
+		"""Remove every element, releasing the storage back to the minimum capacity"""
+		self._reset()
+		self._mutations += 1
+
+	def extend(self, iterable):
+		"""
+		Add the elements of iterable at the back in order. Capacity is reserved once and the elements are
+		block-copied into the ring; with a maxlen, only the elements that stay in the window are copied.
+		"""
+		items = iterable if isinstance(iterable, list) else list(iterable)
+		if self._maxlen is not None:
+			if len(items) > self._maxlen:
+				items = items[len(items) - self._maxlen:]
+			overflow = self._size + len(items) - self._maxlen
+			if overflow > 0:
+				self._clear_run(self._front, overflow)
+				self._front = (self._front + overflow) & self._mask
+				self._size -= overflow
+		self._reserve(self._size + len(items))
+		self._write_run((self._front + self._size) & self._mask, items)
+		self._size += len(items)
+		self._mutations += 1
+
+	def extendleft(self, iterable):
+		"""
+		Add the elements of iterable at the front one after the other, so they end up in reversed order, like
+		collections.deque.extendleft. Capacity is reserved once and the elements are block-copied into the ring.
+		"""
+		items = list(iterable)
+		if self._maxlen is not None:
+			if len(items) > self._maxlen:
+				items = items[len(items) - self._maxlen:]
+			overflow = self._size + len(items) - self._maxlen
+			if overflow > 0:
+				self._clear_run((self._front + self._size - overflow) & self._mask, overflow)
+				self._size -= overflow
+		self._reserve(self._size + len(items))
+		items.reverse()
+		self._front = (self._front - len(items)) & self._mask
+		self._write_run(self._front, items)
+		self._size += len(items)
+		self._mutations += 1
 
 	def first(self):
 		"""Returns (But does not remove) the front element in the queue"""
-		if self.is_empty():
+		if self._size == 0:
 			raise Empty('Queue is empty')
 		return self._data[self._front]
 
 	def last(self):
 		"""Returns (But does not remove) the last element in the queue"""
-		if self.is_empty():
+		if self._size == 0:
 			raise Empty('Queue is empty')
-		last = (self._front + self._size - 1) % len(self._data)
-		return self._data[last]
+		return self._data[(self._front + self._size - 1) & self._mask]
 
 	def add_first(self, e):
 		"""Adds an element e at the front of the queue
 		Re-assigns the front pointer to the new index of the added element.
 		"""
-		if self._size == len(self._data):
-			self._resize(2 * len(self._data))
-		self._front = (self._front - 1) % len(self._data)  # Takes care of cyclic array
-		self._data[self._front] = e
+		if self._size == self._maxlen:
+			if self._size == 0:
+				return
+			self.delete_last()  # Slide the window
+		if self._size > self._mask:
+			self._grow()
+		self._front = front = (self._front - 1) & self._mask  # Takes care of cyclic array
+		self._data[front] = e
 		self._size += 1
+		self._mutations += 1
 
 	def add_last(self, e):
 		"""Adds an element e at the end of the queue
 		Does not affect the front pointer since addition is done essentially at the back of the queue
 		"""
-		if self._size == len(self._data):
-			self._resize(2 * len(self._data))
-		avail = (self._front + self._size) % len(self._data)
-		self._data[avail] = e
-		self._size += 1
+		size = self._size
+		if size == self._maxlen:
+			if size == 0:
+				return
+			self.delete_first()  # Slide the window
+			size -= 1
+		if size > self._mask:
+			self._grow()
+		self._data[(self._front + size) & self._mask] = e
+		self._size = size + 1
+		self._mutations += 1
 
 	def delete_first(self):
 		"""Deletes and returns element e at the front of the queue"""
-		if self.is_empty():
+		if self._size == 0:
 			raise Empty('Queue is empty')
-		front = self._data[self._front]
-		self._data[self._front] = None
-		self._front = (self._front + 1) % len(self._data)
+		data = self._data
+		front = self._front
+		element = data[front]
+		data[front] = None
+		self._front = (front + 1) & self._mask
 		self._size -= 1
-		return front
+		self._mutations += 1
+		if self._size < self._shrink_at:
+			self._shrink()
+		return element
 
 	def delete_last(self):
 		"""Deletes and returns an element e at the end of the queue"""
-		if self.is_empty():
+		if self._size == 0:
 			raise Empty('Queue is empty!')
-		last_idx = (self._front + self._size - 1) % len(self._data)
+		self._size -= 1
+		last_idx = (self._front + self._size) & self._mask
 		last = self._data[last_idx]
 		self._data[last_idx] = None
-		self._size -= 1
+		self._mutations += 1
+		if self._size < self._shrink_at:
+			self._shrink()
 		return last
 
-	def _resize(self, c):
+	def rotate(self, k):
 		"""
-		Resize the queue by allocating new storage of capacity c
-		The size does not change however, only the capacity is extended
+		Circularly shift the queue rightwards with k steps (leftwards if k is negative).
+		A full buffer only moves the front pointer; otherwise the shorter way round is taken, moving
+		min(k, n - k) elements across the gap of free slots.
 		"""
-		old = self._data
-		self._data = [None] * c  # Extend queue capacity
-		walk = self._front
-		for i in range(self._size):
-			self._data[i] = old[walk]
-			walk += (walk + 1) % len(old)
-		self._front = 0  # The new front index is 0 since insertion in the extended queue will be in-order starting
-		# from index 0
+		n = self._size
+		if n == 0:
+			return
+		k %= n
+		self._mutations += 1
+		data, mask = self._data, self._mask
+		if n == len(data):
+			self._front = (self._front - k) & mask
+			return
+		front = self._front
+		back = (front + n) & mask  # First free slot after the last element
+		if k <= n - k:
+			for _ in range(k):  # Move the last k elements to the front
+				back = (back - 1) & mask
+				front = (front - 1) & mask
+				data[front] = data[back]
+				data[back] = None
+		else:
+			for _ in range(n - k):  # Move the first n - k elements to the back
+				data[back] = data[front]
+				data[front] = None
+				front = (front + 1) & mask
+				back = (back + 1) & mask
+		self._front = front
 
-	def rotate(self, k):
-		"""Circularly shift the queue rightwards with k steps"""
-		new = [None] * len(self._data)
-		for j in range(len(self._data)):
-			idx = (j + k) % len(self._data)
-			new[idx] = self._data[j]
-		self._data = new
-		return self._data
+
+def benchmark_ring(count = 1000000, number = 3):
+	"""Time enqueue/dequeue throughput of Queue and ArrayDeque, with collections.deque as a reference"""
+	import timeit
+
+	def fifo(enqueue, dequeue):
+		for i in range(count):
+			enqueue(i)
+		for _ in range(count):
+			dequeue()
+
+	def steady(enqueue, dequeue):
+		# Queue depth stays at 64: every operation wraps around the ring without resizing
+		for i in range(64):
+			enqueue(i)
+		for i in range(count):
+			enqueue(i)
+			dequeue()
+
+	cases = [
+		('Queue', Queue, 'enqueue', 'dequeue'),
+		('ArrayDeque', ArrayDeque, 'add_last', 'delete_first'),
+		('collections.deque', collections.deque, 'append', 'popleft'),
+	]
+	for name, cls, enqueue, dequeue in cases:
+		for label, run in (('fill/drain', fifo), ('steady state', steady)):
+			best = float('inf')
+			for _ in range(number):
+				q = cls()
+				best = min(best, timeit.timeit(lambda: run(getattr(q, enqueue), getattr(q, dequeue)), number = 1))
+			print('{0:<20}{1:<14}{2:>12.0f} ops/s'.format(name, label, 2 * count / best))
+
+
+class _SharedQueue:
+	"""
+	Common state of ConcurrentQueue and AsyncQueue: a Queue circular array holding the elements and an optional
+	bound. maxsize <= 0 means the queue is unbounded.
+	"""
+
+	def __init__(self, maxsize = 0, policy = None):
+		self._queue = Queue(policy)
+		self._maxsize = maxsize
+
+	def __len__(self):
+		return len(self._queue)
+
+	@property
+	def maxsize(self):
+		return self._maxsize
+
+	def is_empty(self):
+		return self._queue.is_empty()
+
+	def is_full(self):
+		return 0 < self._maxsize <= len(self._queue)
+
+	def _room(self):
+		"""Return how many elements can be added before the queue is full"""
+		if self._maxsize <= 0:
+			return float('inf')
+		return self._maxsize - len(self._queue)
+
+	def _put_batch(self, items, start):
+		"""Enqueue items[start:] until the queue is full, returning the index of the first element left over"""
+		room = self._room()
+		stop = len(items) if room >= len(items) - start else start + room
+		enqueue = self._queue.enqueue
+		for k in range(start, stop):
+			enqueue(items[k])
+		return stop
+
+	def _get_batch(self, max_items):
+		"""Dequeue up to max_items elements (all of them when max_items is None) in FIFO order"""
+		count = len(self._queue) if max_items is None else min(max_items, len(self._queue))
+		dequeue = self._queue.dequeue
+		return [dequeue() for _ in range(count)]
+
+
+class ConcurrentQueue(_SharedQueue):
+	"""
+	Thread-safe FIFO queue on the Queue circular array.
+	put/get block, with an optional timeout, while a bounded queue is full or the queue is empty, which applies
+	backpressure to producers. put_many/get_many move a whole batch of elements per lock acquisition instead of
+	paying the lock and wake-up cost per element.
+	"""
+
+	def __init__(self, maxsize = 0, policy = None):
+		super().__init__(maxsize, policy)
+		self._lock = threading.Lock()
+		self._not_empty = threading.Condition(self._lock)
+		self._not_full = threading.Condition(self._lock)
+
+	@staticmethod
+	def _wait(condition, ready, block, deadline, error):
+		"""Wait on condition (its lock held) until ready() holds, raising error if not blocking or past the deadline"""
+		while not ready():
+			if not block:
+				raise error
+			if deadline is None:
+				condition.wait()
+			elif not condition.wait(deadline - time.monotonic()) and not ready():
+				raise error
+
+	@staticmethod
+	def _deadline(timeout):
+		if timeout is None:
+			return None
+		if timeout < 0:
+			raise ValueError('timeout must be a non-negative number')
+		return time.monotonic() + timeout
+
+	def put(self, item, block = True, timeout = None):
+		"""
+		Add item at the back of the queue, waiting up to timeout seconds (forever if None) for a free slot.
+		Raise Full if no slot becomes free, or at once when block is False.
+		"""
+		with self._lock:
+			self._wait(self._not_full, self._room, block, self._deadline(timeout), Full('Queue is full'))
+			self._queue.enqueue(item)
+			self._not_empty.notify()
+
+	def get(self, block = True, timeout = None):
+		"""
+		Remove and return the front element, waiting up to timeout seconds (forever if None) for one to arrive.
+		Raise Empty if none arrives, or at once when block is False.
+		"""
+		with self._lock:
+			self._wait(self._not_empty, self._queue.__len__, block, self._deadline(timeout), Empty('Queue is empty'))
+			item = self._queue.dequeue()
+			self._not_full.notify()
+			return item
+
+	def put_nowait(self, item):
+		return self.put(item, block = False)
+
+	def get_nowait(self):
+		return self.get(block = False)
+
+	def put_many(self, items, block = True, timeout = None):
+		"""
+		Add every element of items in order. An unbounded queue takes the whole batch in one lock acquisition; a
+		bounded one takes as much as fits each time room frees up. Raise Full if the batch does not fit in time,
+		in which case the elements already added stay queued and the message says how many were left out.
+		"""
+		items = items if isinstance(items, (list, tuple)) else list(items)
+		deadline = self._deadline(timeout)
+		done = 0
+		while done < len(items):
+			with self._lock:
+				try:
+					self._wait(self._not_full, self._room, block, deadline, Full('Queue is full'))
+				except Full:
+					raise Full('Queue is full: {0} of {1} elements not added'.format(len(items) - done, len(items)))
+				added = self._put_batch(items, done)
+				self._not_empty.notify(added - done)
+				done = added
+
+	def get_many(self, max_items = None, block = True, timeout = None):
+		"""
+		Remove and return a list of up to max_items front elements (all of them if None) in one lock acquisition,
+		waiting as get() does for at least one element to arrive.
+		"""
+		with self._lock:
+			self._wait(self._not_empty, self._queue.__len__, block, self._deadline(timeout), Empty('Queue is empty'))
+			items = self._get_batch(max_items)
+			self._not_full.notify(len(items))
+			return items
+
+
+class AsyncQueue(_SharedQueue):
+	"""
+	asyncio FIFO queue on the Queue circular array, for coroutines of a single event loop.
+	put/get/put_many/get_many are awaitable equivalents of the ConcurrentQueue methods; waiting coroutines queue up
+	as futures and are woken in arrival order. The *_nowait methods never suspend.
+	"""
+
+	def __init__(self, maxsize = 0, policy = None):
+		super().__init__(maxsize, policy)
+		self._getters = collections.deque()
+		self._putters = collections.deque()
+
+	@staticmethod
+	def _wakeup(waiters, count = 1):
+		"""Resume up to count waiting coroutines"""
+		while count > 0 and waiters:
+			waiter = waiters.popleft()
+			if not waiter.done():
+				waiter.set_result(None)
+				count -= 1
+
+	async def _wait(self, waiters, ready, timeout, error):
+		"""Suspend until ready() holds, raising error once timeout seconds (None waits forever) have passed"""
+		if ready():
+			return
+		loop = asyncio.get_running_loop()
+		deadline = None if timeout is None else loop.time() + timeout
+		while not ready():
+			waiter = loop.create_future()
+			waiters.append(waiter)
+			try:
+				if deadline is None:
+					await waiter
+				else:
+					await asyncio.wait_for(waiter, max(deadline - loop.time(), 0))
+			except BaseException as exc:
+				waiter.cancel()
+				try:
+					waiters.remove(waiter)
+				except ValueError:
+					pass
+				if ready():
+					# A wake-up meant for this coroutine may have been spent on it: pass it on
+					self._wakeup(waiters)
+				if isinstance(exc, asyncio.TimeoutError):
+					raise error from None
+				raise
+
+	def put_nowait(self, item):
+		"""Add item at the back of the queue, raising Full if a bounded queue has no free slot"""
+		if self.is_full():
+			raise Full('Queue is full')
+		self._queue.enqueue(item)
+		self._wakeup(self._getters)
+
+	def get_nowait(self):
+		"""Remove and return the front element, raising Empty if there is none"""
+		if self._queue.is_empty():
+			raise Empty('Queue is empty')
+		item = self._queue.dequeue()
+		self._wakeup(self._putters)
+		return item
+
+	async def put(self, item, timeout = None):
+		await self._wait(self._putters, self._room, timeout, Full('Queue is full'))
+		self.put_nowait(item)
+
+	async def get(self, timeout = None):
+		await self._wait(self._getters, self._queue.__len__, timeout, Empty('Queue is empty'))
+		return self.get_nowait()
+
+	async def put_many(self, items, timeout = None):
+		"""Add every element of items in order, suspending while a bounded queue is full (see ConcurrentQueue)"""
+		items = items if isinstance(items, (list, tuple)) else list(items)
+		loop = asyncio.get_running_loop()
+		deadline = None if timeout is None else loop.time() + timeout
+		done = 0
+		while done < len(items):
+			remaining = None if deadline is None else max(deadline - loop.time(), 0)
+			try:
+				await self._wait(self._putters, self._room, remaining, Full('Queue is full'))
+			except Full:
+				raise Full('Queue is full: {0} of {1} elements not added'.format(len(items) - done, len(items)))
+			added = self._put_batch(items, done)
+			self._wakeup(self._getters, added - done)
+			done = added
+
+	async def get_many(self, max_items = None, timeout = None):
+		"""Remove and return a list of up to max_items front elements once at least one is available"""
+		await self._wait(self._getters, self._queue.__len__, timeout, Empty('Queue is empty'))
+		items = self._get_batch(max_items)
+		self._wakeup(self._putters, len(items))
+		return items
+
+
+def benchmark(count = 200000, batch = 512, maxsize = 4096):
+	"""
+	Time moving count elements from a producer to a consumer through a bounded queue.Queue/asyncio.Queue one
+	element at a time, and through ConcurrentQueue/AsyncQueue both per element and in batches.
+	"""
+	import queue
+
+	def threaded(q, put, get):
+		def produce():
+			for start in range(0, count, batch):
+				put(q, range(start, min(start + batch, count)))
+		received = []
+		producer = threading.Thread(target = produce)
+		began = time.perf_counter()
+		producer.start()
+		while len(received) < count:
+			received.extend(get(q))
+		producer.join()
+		assert received == list(range(count))
+		return time.perf_counter() - began
+
+	def one_by_one(q, items):
+		for item in items:
+			q.put(item)
+
+	cases = [
+		('queue.Queue put/get', queue.Queue(maxsize), one_by_one, lambda q: (q.get(),)),
+		('ConcurrentQueue put/get', ConcurrentQueue(maxsize), one_by_one, lambda q: (q.get(),)),
+		('ConcurrentQueue put_many/get_many', ConcurrentQueue(maxsize), ConcurrentQueue.put_many, ConcurrentQueue.get_many),
+	]
+	for name, q, put, get in cases:
+		print('{0:<40}{1:>10.0f} items/s'.format(name, count / threaded(q, put, get)))
+
+	async def coroutines(q, put, get):
+		async def produce():
+			for start in range(0, count, batch):
+				await put(q, range(start, min(start + batch, count)))
+		received = []
+		began = time.perf_counter()
+		producer = asyncio.ensure_future(produce())
+		while len(received) < count:
+			received.extend(await get(q))
+		await producer
+		assert received == list(range(count))
+		return time.perf_counter() - began
+
+	async def put_each(q, items):
+		for item in items:
+			await q.put(item)
+
+	async def get_one(q):
+		return (await q.get(),)
+
+	cases = [
+		('asyncio.Queue put/get', asyncio.Queue, put_each, get_one),
+		('AsyncQueue put/get', AsyncQueue, put_each, get_one),
+		('AsyncQueue put_many/get_many', AsyncQueue, AsyncQueue.put_many, AsyncQueue.get_many),
+	]
+	for name, cls, put, get in cases:
+		elapsed = asyncio.run(coroutines(cls(maxsize), put, get))
+		print('{0:<40}{1:>10.0f} items/s'.format(name, count / elapsed))
 
 
 if __name__ == '__main__':
@@ -190,4 +724,64 @@ if __name__ == '__main__':
 	deque.rotate(-1)
 	assert deque.first() == 0 and deque.last() == 9, 'Should revert with a single cyclic shift to the left.'
 	print(deque)
+	assert deque[0] == 0 and deque[-1] == 9 and list(reversed(deque))[0] == 9, 'Should index from the ring offset'
+	deque.extendleft([-1, -2])
+	deque.extend(range(10, 30))
+	assert list(deque) == list(range(-2, 30)), 'Should extend both ends'
+	try:
+		for element in deque:
+			deque.delete_first()
+	except RuntimeError:
+		pass
+	else:
+		raise AssertionError('Should detect a mutation during iteration')
+	window = ArrayDeque(range(5), maxlen = 3)
+	window.add_last(5)
+	window.extend([6, 7])
+	assert repr(window) == 'ArrayDeque([5, 6, 7], maxlen=3)', 'Should keep the last maxlen elements'
+	window.extendleft([1, 2])
+	assert list(window) == [2, 1, 5], 'Should drop from the back when extending the front'
+	window.clear()
+	assert len(window) == 0 and list(window) == [], 'Should be emptied'
+
+	burst = ArrayDeque(policy = ResizePolicy(grow = 4, shrink_below = 0.125, min_capacity = 8))
+	burst.extend(range(1000))
+	peak = burst.stats()['capacity']
+	while len(burst) > 10:
+		burst.delete_last()
+	assert burst.stats()['capacity'] < peak and burst.stats()['capacity'] >= 8, 'Should shrink after the burst'
+	resizes = burst.stats()['resizes']
+	burst.extend(range(40))
+	assert burst.stats()['resizes'] == resizes, 'Should absorb a small burst without resizing'
+
+	cq = ConcurrentQueue(maxsize = 3)
+	cq.put_many([1, 2])
+	cq.put(3)
+	assert cq.is_full() and cq.get() == 1, 'Should dequeue in FIFO order'
+	try:
+		cq.put_many([4, 5], timeout = 0.01)
+	except Full:
+		assert cq.get_many() == [2, 3, 4], 'Should keep the elements that fitted'
+	else:
+		raise AssertionError('Should time out on a full queue')
+	try:
+		cq.get(timeout = 0.01)
+	except Empty:
+		pass
+	else:
+		raise AssertionError('Should time out on an empty queue')
 
+	async def exercise():
+		aq = AsyncQueue(maxsize = 2)
+		consumer = asyncio.ensure_future(aq.get_many())
+		await aq.put_many([1, 2, 3, 4])
+		assert await consumer + await aq.get_many() == [1, 2, 3, 4], 'Should pass the batch through in order'
+		try:
+			await aq.get(timeout = 0.01)
+		except Empty:
+			pass
+		else:
+			raise AssertionError('Should time out on an empty queue')
+	asyncio.run(exercise())
+	benchmark_ring()
+	benchmark()
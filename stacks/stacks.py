@@ -1,4 +1,8 @@
 """Stacks and Queues"""
+import itertools
+import re
+from array import array
+from collections import namedtuple
 
 
 class Empty(Exception):
@@ -12,61 +16,186 @@ class Full(Exception):
 
 
 class ArrayStack:
-	"""LIFO Implementation based on list storage"""
+	"""
+	LIFO Implementation based on list storage.
+	ArrayStack() grows without bound, ArrayStack(max_len) preallocates max_len slots and raises Full beyond them.
+	With a typecode e.g 'i' or 'd' the elements are kept unboxed in an array.array instead of a list.
+	The constructor returns a subclass specialised for the chosen storage so no operation branches on it.
+	"""
+	__slots__ = ()
+
+	def __new__(cls, max_len = None, typecode = None):
+		if cls is ArrayStack:
+			cls = _BoundedStack if max_len is not None else _UnboundedStack
+		return super().__new__(cls)
+
+	def push_many(self, values):
+		"""Push every value of an iterable, the last one ending up on top"""
+		raise NotImplementedError('Must be implemented by subclass')
+
+	def pop_many(self, k):
+		"""Remove and return the k topmost items as a list in pop order (topmost first)"""
+		raise NotImplementedError('Must be implemented by subclass')
+
+	def clear(self):
+		"""Remove all elements at once"""
+		raise NotImplementedError('Must be implemented by subclass')
+
+	def _items(self):
+		"""Return the stored elements bottom to top as a list or array"""
+		raise NotImplementedError('Must be implemented by subclass')
+
+	def transfer_reversed(self, target):
+		"""
+		Move all elements onto target in the order transfer(S, T) pops and pushes them: the top of this stack is
+		pushed first, so its bottom element ends up on top of target. One reversed slice and one block push.
+		If target is bounded and too small, Full is raised and neither stack changes.
+		"""
+		if target is self:
+			raise ValueError('Cannot transfer a stack onto itself')
+		target.push_many(self._items()[::-1])
+		self.clear()
+
+	def splice(self, other):
+		"""Move all elements of other on top of this stack keeping their order, so other's top becomes the top"""
+		if other is self:
+			raise ValueError('Cannot splice a stack onto itself')
+		if isinstance(other, ArrayStack):
+			self.push_many(other._items())
+			other.clear()
+		else:
+			self.push_many(other.pop_many(len(other))[::-1])
+
+
+class _UnboundedStack(ArrayStack):
+	"""ArrayStack storing its elements directly in a growable list or array.array"""
+	__slots__ = '_data'
+
+	def __init__(self, max_len = None, typecode = None):
+		self._data = array(typecode) if typecode is not None else []
+
+	def __len__(self):
+		return len(self._data)
+
+	def __repr__(self):
+		"""Returns representational str of the array"""
+		return str(list(self._data))
 
-	def __init__(self, max_len = None):
+	def is_empty(self):
+		return not self._data
+
+	def push(self, val):
+		"""Adds a value to the top of the stack"""
+		self._data.append(val)
+
+	def push_many(self, values):
+		"""Push every value of an iterable, the last one ending up on top"""
+		self._data.extend(values)
+
+	def top(self):
+		"""Return the top item. Raise Empty error if topmost item in stack is not found"""
+		try:
+			return self._data[-1]
+		except IndexError:
+			raise Empty('Stack is empty') from None
+
+	def pop(self):
+		"""Remove the topmost item in the stack"""
+		try:
+			return self._data.pop()
+		except IndexError:
+			raise Empty('Stack is empty') from None
+
+	def pop_many(self, k):
+		"""Remove and return the k topmost items as a list in pop order (topmost first)"""
+		data = self._data
+		if not 0 <= k <= len(data):
+			raise Empty('Stack holds fewer than {0} elements'.format(k))
+		items = list(data[len(data) - k:])
+		del data[len(data) - k:]
+		items.reverse()
+		return items
+
+	def clear(self):
+		"""Remove all elements at once"""
+		del self._data[:]
+
+	def _items(self):
+		return self._data
+
+
+class _BoundedStack(ArrayStack):
+	"""ArrayStack over max_len preallocated slots"""
+	__slots__ = '_data', '_n', '_max_len', '_typecode'
+
+	def __init__(self, max_len = None, typecode = None):
 		self._max_len = max_len
-		self._data = []
+		self._typecode = typecode
+		self._data = array(typecode, [0]) * max_len if typecode is not None else [None] * max_len
 		self._n = 0
-		if self._max_len:
-			self._data = [None] * self._max_len
 
 	def __len__(self):
-		if self._max_len is not None:
-			return self._n
-		return len(self._data)
+		return self._n
 
 	def __repr__(self):
 		"""Returns representational str of the array"""
-		if self._max_len is not None:
-			return str(self._data[0:self._n])
-		return str(self._data)
+		return str(list(self._data[0:self._n]))
 
 	def is_empty(self):
-		if self._max_len is not None:
-			return self._n == 0
-		return self._data == []
+		return self._n == 0
 
 	def push(self, val):
 		"""Adds a value to the top of the stack"""
-		if self._max_len is not None and self._n == self._max_len:
+		if self._n == self._max_len:
 			raise Full('Stack is full')
-		# Append element then increment _n if max_len is specified.
-		if self._max_len is not None:
-			self._data[self._n] = val
-			self._n += 1
-			return
-		else:
-			return self._data.append(val)
+		self._data[self._n] = val
+		self._n += 1
+
+	def push_many(self, values):
+		"""Push every value of an iterable, the last one ending up on top. Nothing is pushed if they do not fit"""
+		values = array(self._typecode, values) if self._typecode is not None else list(values)
+		n, m = self._n, len(values)
+		if n + m > self._max_len:
+			raise Full('Stack is full')
+		self._data[n:n + m] = values
+		self._n = n + m
 
 	def top(self):
 		"""Return the top item. Raise Empty error if topmost item in stack is not found"""
-		if self.is_empty():
+		if self._n == 0:
 			raise Empty('Stack is empty')
-		if self._max_len is not None:
-			return self._data[self._n - 1]
-		return self._data[-1]
+		return self._data[self._n - 1]
 
 	def pop(self):
 		"""Remove the topmost item in the stack"""
-		if self.is_empty():
+		if self._n == 0:
 			raise Empty('Stack is empty')
-		if self._max_len is not None:
-			val = self._data[self._n - 1]
-			self._data[self._n - 1] = None
-			self._n -= 1
-			return val
-		return self._data.pop()
+		self._n -= 1
+		val = self._data[self._n]
+		if self._typecode is None:
+			self._data[self._n] = None
+		return val
+
+	def pop_many(self, k):
+		"""Remove and return the k topmost items as a list in pop order (topmost first)"""
+		n = self._n
+		if not 0 <= k <= n:
+			raise Empty('Stack holds fewer than {0} elements'.format(k))
+		items = list(self._data[n - k:n])
+		if self._typecode is None:
+			self._data[n - k:n] = [None] * k  # Release the references held by the vacated slots
+		self._n = n - k
+		items.reverse()
+		return items
+
+	def clear(self):
+		"""Remove all elements at once"""
+		if self._typecode is None:
+			self._data[0:self._n] = [None] * self._n
+		self._n = 0
+
+	def _items(self):
+		return self._data[0:self._n]
 
 
 def is_matched(expr):
@@ -89,27 +218,225 @@ def is_matched(expr):
 	return stack.is_empty()  # Ensure that search is complete
 
 
-def is_matched_html(raw):
-	"""Returns True if all HTML tags are a proper match; False otherwise"""
-	stack = ArrayStack()
-	j = raw.find('<')  # Find first opening tag
-	while j != -1:  # Confirm if there is an HTML Tag
-		k = raw.find('>', j + 1)  # Search for the closing tag
-		if k == -1:
-			return False  # Closing Tag not Found
-		tag = raw[j + 1:k]  # The html tag e.g title or /title
-		if not tag.startswith('/'):
-			stack.push(tag)
-		else:
-			if stack.is_empty():
-				return False  # Empty stack yet a closing tag is found means the html tag is not valid
-			if tag[1:] != stack.pop():  # Access the tag from index 1 to remove / since its a closing tag
-				return False  # The closing tag does not match the topmost one in the stack(Should be its opening)
-		j = raw.find('<', k + 1)  # j(opening tag) is now searched for from the index k+1
-	return stack.is_empty()  # If the stack is empty all tags have matches: Note how stack.pop() is used during
+DelimiterMatch = namedtuple('DelimiterMatch', 'ok offset line column reason')
+
+# Precomputed delimiter codes, keyed by what findall returns: openers are 1-3 and the closer of opener c is -c
+_DELIMITERS = '([{)]}'
+_CODES = {c: code if code < 4 else 3 - code for code, c in enumerate(_DELIMITERS, 1)}
+_TEXT_SCAN = re.compile(r'[(){}\[\]]'), _CODES, '\n'
+_BYTES_SCAN = re.compile(rb'[(){}\[\]]'), {c.encode(): code for c, code in _CODES.items()}, b'\n'
+
+
+def _read_chunks(source, chunk_size):
+	"""Yield str or bytes chunks from a string, a file object or an iterator of chunks"""
+	if isinstance(source, (str, bytes)):
+		for i in range(0, len(source), chunk_size):
+			yield source[i:i + chunk_size]
+	elif hasattr(source, 'read'):
+		yield from iter(lambda: source.read(chunk_size), source.read(0))
+	else:
+		yield from source
+
+
+def validate_delimiters(source, chunk_size = 1 << 16):
+	"""
+	Streaming version of is_matched for inputs too large to hold in memory.
+	source is a string, a text or binary file object, or an iterator of str/bytes chunks. Only one chunk is held
+	at a time: a regular expression collects the delimiters of a chunk as a list of strings and the stack holds
+	integer codes, not characters. Positions are only worked out for a mismatch and for the openers that outlive
+	their chunk, so the hot loop creates no match objects.
+	Returns a DelimiterMatch; on failure offset, line and column (1-based) locate the offending delimiter,
+	which is the innermost unclosed opener when the input ends early.
+	"""
+	stack = []  # Code of every unclosed opener, with bit 4 set once the opener outlived its chunk
+	push, pop = stack.append, stack.pop
+	where = []  # (offset, line, column) of those carried openers, which are always stack[:len(where)]
+	base = 0  # Offset of the current chunk in the whole input
+	line, line_start = 1, 0  # Line number and start offset at the chunk position scanned
+	for chunk in _read_chunks(source, chunk_size):
+		pattern, codes, newline = _BYTES_SCAN if isinstance(chunk, bytes) else _TEXT_SCAN
+		found = pattern.findall(chunk)
+		delimiters = iter(found)
+		for delimiter in delimiters:
+			code = codes[delimiter]
+			if code > 0:
+				push(code)
+			elif stack and stack[-1] & 3 == -code:
+				pop()
+			else:
+				# The offending delimiter is the one before those left in the iterator: find it again by its index
+				index = len(found) - len(list(delimiters)) - 1
+				pos = next(itertools.islice(pattern.finditer(chunk), index, None)).start()
+				newlines = chunk.count(newline, 0, pos)
+				if newlines:
+					line += newlines
+					line_start = base + chunk.rfind(newline, 0, pos) + 1
+				reason = 'unexpected {0!r}'.format(_DELIMITERS[2 - code]) if not stack else \
+					'{0!r} does not close {1!r}'.format(_DELIMITERS[2 - code], _DELIMITERS[(stack[-1] & 3) - 1])
+				return DelimiterMatch(False, base + pos, line, base + pos - line_start + 1, reason)
+		# Openers pushed by this chunk sit above the carried ones. Those still open are the last unmatched openers
+		# of the chunk, so a scan back from its end finds them, usually after a few delimiters
+		carried = len(stack)
+		while carried and stack[carried - 1] < 4:
+			carried -= 1
+		del where[carried:]
+		positions = []
+		if carried < len(stack):
+			depth, last = 0, len(chunk) - 1
+			for match in pattern.finditer(chunk[::-1]):
+				if codes[match.group()] < 0:
+					depth += 1
+				elif depth:
+					depth -= 1
+				else:
+					positions.append(last - match.start())
+					if len(positions) == len(stack) - carried:
+						break
+			positions.reverse()
+		scanned = 0
+		for k, pos in enumerate(positions, carried):
+			newlines = chunk.count(newline, scanned, pos)
+			if newlines:
+				line += newlines
+				line_start = base + chunk.rfind(newline, scanned, pos) + 1
+			scanned = pos
+			where.append((base + pos, line, base + pos - line_start + 1))
+			stack[k] |= 4
+		newlines = chunk.count(newline, scanned)
+		if newlines:
+			line += newlines
+			line_start = base + chunk.rfind(newline, scanned) + 1
+		base += len(chunk)
+	if stack:
+		offset, line, column = where[-1]
+		return DelimiterMatch(False, offset, line, column, 'unclosed {0!r}'.format(_DELIMITERS[(stack[-1] & 3) - 1]))
+	return DelimiterMatch(True, None, None, None, None)
 
 
-# comparison to make sure any matching tag in the stack is removed.
+def benchmark_delimiters(size = 1 << 20, number = 3):
+	"""
+	Compare the throughput of is_matched and validate_delimiters on generated source-like text and on a
+	delimiter-dense expression, where every other character has to go through the stack.
+	"""
+	import io
+	import timeit
+	units = {
+		'source-like': '    total = compute(values[index], {"key": other}) + offset  # note\n',
+		'dense': '{[(a+b)*c]-(d/e)}\n',
+	}
+	for label, unit in units.items():
+		expr = unit * (size // len(unit))
+		for name, fn in (
+			('is_matched', lambda: is_matched(expr)),
+			('validate_delimiters', lambda: validate_delimiters(io.StringIO(expr)).ok),
+		):
+			assert fn() is True
+			seconds = min(timeit.repeat(fn, number = 1, repeat = number))
+			print('{0:<12}{1:<20}{2:>10.1f} MB/s'.format(label, name, len(expr) / seconds / 1e6))
+
+
+# Elements that never have a closing tag
+VOID_ELEMENTS = frozenset([
+	'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'keygen', 'link', 'meta', 'param', 'source',
+	'track', 'wbr',
+])
+_TAG_NAME = re.compile(r'<(/?)([A-Za-z][^\s/>]*)')
+
+
+class HTMLTagMatcher:
+	"""
+	Incremental HTML tag matcher: feed(data) it a document chunk by chunk, then close() tells if all tags matched.
+	Only the stack of open tag names and an unfinished tag at the end of a chunk are kept between feeds, so
+	arbitrarily large documents are checked in constant memory (for a bounded nesting depth).
+	Tag names are matched case-insensitively and without their attributes. Void elements (<br>), self-closing
+	tags (<x/>), comments, doctypes and processing instructions do not need closing.
+	"""
+	__slots__ = '_stack', '_pending', '_offset', '_in_comment', 'error'
+
+	def __init__(self):
+		self._stack = ArrayStack()
+		self._pending = ''  # Start of a tag that was cut off by the end of the previous chunk
+		self._offset = 0  # Offset of the next fed chunk in the document
+		self._in_comment = False
+		self.error = None  # (offset, message) of the first problem found
+
+	def feed(self, data):
+		"""Process the next chunk of the document"""
+		if self.error is not None:
+			return
+		text = self._pending + data if self._pending else data
+		base = self._offset - len(self._pending)  # Document offset of text[0]
+		self._offset += len(data)
+		self._pending = ''
+		j = 0
+		while True:
+			if self._in_comment:
+				k = text.find('-->', j)
+				if k == -1:
+					# Keep just enough for a terminator that straddles the chunk boundary
+					self._pending = text[max(j, len(text) - 2):]
+					return
+				self._in_comment = False
+				j = k + 3
+			j = text.find('<', j)
+			if j == -1:
+				return
+			if text.startswith('<!--', j):
+				self._in_comment = True
+				j += 4
+				continue
+			following = text[j + 1:j + 2]
+			if following and not (following.isalpha() or following in '/!?'):
+				j += 1  # A literal '<' in text, e.g "a < b"
+				continue
+			k = text.find('>', j + 1)
+			if k == -1:
+				self._pending = text[j:]  # The tag continues in the next chunk
+				return
+			match = _TAG_NAME.match(text, j)
+			if match is not None:
+				name = match.group(2).lower()
+				if match.group(1):
+					if name not in VOID_ELEMENTS and not self._close_tag(name, base + j):
+						return
+				elif name not in VOID_ELEMENTS and text[k - 1] != '/':
+					self._stack.push(name)
+			j = k + 1
+
+	def _close_tag(self, name, offset):
+		"""Pop the open tag matching a closing tag, recording an error if it does not match"""
+		if self._stack.is_empty():
+			self.error = (offset, 'unexpected </{0}>'.format(name))
+			return False
+		opened = self._stack.pop()
+		if opened != name:
+			self.error = (offset, '</{0}> does not close <{1}>'.format(name, opened))
+			return False
+		return True
+
+	def close(self):
+		"""Finish the document. Returns True if all HTML tags are a proper match; False otherwise"""
+		if self.error is None:
+			if self._in_comment:
+				self.error = (self._offset, 'unterminated comment')
+			elif self._pending:
+				self.error = (self._offset - len(self._pending), 'unterminated tag')
+			elif not self._stack.is_empty():
+				self.error = (self._offset, 'unclosed <{0}>'.format(self._stack.top()))
+		return self.error is None
+
+
+def is_matched_html(raw, chunk_size = 1 << 16):
+	"""
+	Returns True if all HTML tags are a proper match; False otherwise.
+	raw is a string, a text file object or an iterator of text chunks, fed to an HTMLTagMatcher chunk by chunk.
+	"""
+	matcher = HTMLTagMatcher()
+	for chunk in _read_chunks(raw, chunk_size):
+		matcher.feed(chunk)
+		if matcher.error is not None:
+			return False
+	return matcher.close()
 
 
 def transfer(S, T):
@@ -123,15 +450,18 @@ def transfer(S, T):
 	# for i in range(len(S)):
 	# 	T.push(S.pop())
 	# OR :
-	while not S.is_empty():
-		T.push(S.pop())
+	# while not S.is_empty():
+	# 	T.push(S.pop())
+	# OR as a single block move:
+	S.transfer_reversed(T)
 
 	return (S, T)
 
 
 def pop_recurs(stack):
 	"""
-	Give a recursive method for removing all the elements from a stack
+	Give a recursive method for removing all the elements from a stack.
+	Recursion depth grows with the stack size: use stack.clear() on large stacks.
 	"""
 	if stack.is_empty():
 		return stack
@@ -143,7 +473,8 @@ def pop_recurs(stack):
 def reverse_list_with_stack(data):
 	"""
 	Implement a function that reverses a list of elements by pushing them onto
-	a stack in one order, and writing them back to the list in reversed order
+	a stack in one order, and writing them back to the list in reversed order.
+	This costs a full copy of the list: arrays/reversal.py reverses in place instead.
 	"""
 	stack = ArrayStack()
 	for elem in data:
@@ -169,4 +500,19 @@ if __name__ == '__main__':
 	assert len(s) is 0, "Stack S should be emptied"
 	assert len(t) is 5, "Stack T should hold the copied elements from S"
 	assert t.top() == 0, "Top stack element should now be 0"
+	typed = ArrayStack(max_len = 10, typecode = 'i')
+	typed.push_many(range(6))
+	assert typed.pop_many(3) == [5, 4, 3] and typed.top() == 2, "Should pop a block in pop order"
+	assert validate_delimiters('{[()]}\n()', chunk_size = 3).ok, "Should match across chunk boundaries"
+	assert validate_delimiters('(a\n  [b)', chunk_size = 4)[1:4] == (7, 2, 5), "Should locate the mismatched ')'"
+	page = '<!DOCTYPE html><html><Body class="x"><p>a < b<br><img src="i.png"/><!-- <p> --></p></body></html>'
+	assert all(is_matched_html(page, chunk_size = n) for n in range(1, 12)), "Should match across chunk boundaries"
+	assert not is_matched_html('<div><span></div>'), "Should reject crossed tags"
+	big = ArrayStack()
+	big.push_many(range(10 ** 6))
+	t.splice(big)
+	assert len(t) == 10 ** 6 + 5 and t.top() == 10 ** 6 - 1 and big.is_empty(), "Should splice in order"
+	t.clear()
+	assert t.is_empty(), "Should clear without recursion"
+	assert validate_delimiters(b'x\n{(\n)', chunk_size = 2)[1:4] == (2, 2, 1), "Should locate the unclosed '{'"
 	# print(reverse_list_with_stack([1, 2, 3, 4, 5]))